@@ -3,13 +3,13 @@ MODEL (
     time_column acq_date
   ),
   description 'Fires from the NASA FIRMS project, only necessary columns and coords are converted to geom',
-  grain (longitude, latitude, acq_date)
+  grain id
 );
 
 SELECT
   (
-    ROW_NUMBER() OVER (ORDER BY r.acq_date, r.acq_time, r.longitude, r.latitude)
-  )::INT AS id, /* FIRMS identifier, ordered by datetime and coords */
+    MD5_NUMBER_LOWER(CONCAT_WS('|', r.satellite, r.acq_date, r.acq_time, r.longitude, r.latitude)) >> 1
+  )::BIGINT AS id, /* FIRMS identifier, hash of satellite, datetime and coords that is the same across reruns */
   r.acq_date, /* acquisition date of the FIRMS detection */
   ST_POINT(r.longitude, r.latitude)::GEOMETRY AS geom /* point geometry of the FIRMS detection */
 FROM staging.firms AS r
@@ -1,16 +1,57 @@
 MODEL (
-  kind VIEW,
-  description "FIRMS events pending validation.",
+  kind INCREMENTAL_BY_TIME_RANGE (
+    time_column acq_date
+  ),
+  description "FIRMS events pending validation, with their include area, GADM areas and nearest settlement, which are looked up once per detection. Restate it after editing the include areas, GADM areas or settlements.",
+  grain (firms_id, area_include_id),
   audits (
-    NUMBER_OF_ROWS(threshold := 1)
+    NUMBER_OF_ROWS_NON_BLOCKING(threshold := 1)
   )
 );
 
+WITH detections AS (
+  SELECT
+    f.id AS firms_id,
+    f.acq_date,
+    f.geom,
+    i.id AS area_include_id,
+    i.geom AS area_include_geom,
+    g.country_id,
+    g.gadm_1,
+    @IF(@gadm_level >= 2, g.gadm_2),
+    @IF(@gadm_level >= 3, g.gadm_3)
+  FROM intermediate.firms AS f
+  JOIN reference.areas_include AS i
+    ON ST_INTERSECTS(f.geom, i.geom)
+  LEFT JOIN reference.gadm AS g
+    ON ST_INTERSECTS(f.geom, g.geom)
+  WHERE
+    f.acq_date BETWEEN @start_ds AND @end_ds
+  /* detections on the border of GADM areas get one of them */
+  QUALIFY
+    ROW_NUMBER() OVER (PARTITION BY f.id, i.id ORDER BY g.gadm_1) = 1
+), settlements AS (
+  SELECT
+    d.firms_id,
+    g.name AS settlement_name,
+    ST_DISTANCE(d.geom, g.geom) AS settlement_distance
+  FROM detections AS d
+  JOIN reference.geonames AS g
+    ON ST_DWITHIN(d.geom, g.geom, @geonames_max_distance)
+  QUALIFY
+    ROW_NUMBER() OVER (PARTITION BY d.firms_id ORDER BY settlement_distance ASC) = 1
+)
 SELECT
-  f.id AS firms_id,
-  f.acq_date,
-  ST_ASWKB(f.geom)::BLOB AS geom,
-  ST_ASWKB(i.geom)::BLOB AS area_include_geom
-FROM intermediate.firms AS f
-JOIN reference.areas_include AS i
-  ON ST_INTERSECTS(f.geom, i.geom)
\ No newline at end of file
+  d.firms_id,
+  d.acq_date,
+  d.geom::GEOMETRY AS geom, /* point geometry of the FIRMS detection */
+  d.area_include_id, /* include area the detection is in */
+  d.area_include_geom::GEOMETRY AS area_include_geom,
+  d.* EXCLUDE (firms_id, acq_date, geom, area_include_id, area_include_geom), /* GADM areas of the detection */
+  s.settlement_name, /* name of the nearest geoname settlement */
+  s.settlement_distance /* distance to the nearest settlement */
+FROM detections AS d
+LEFT JOIN settlements AS s
+  ON d.firms_id = s.firms_id;
+
+@CREATE_SPATIAL_INDEX(@this_model, geom)
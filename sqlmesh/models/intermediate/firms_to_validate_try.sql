@@ -8,7 +8,10 @@ MODEL (
 @DEF(validated_try, @EVAL(@try_ - 1));
 
 SELECT
-  *
+  * REPLACE (
+    ST_ASWKB(geom)::BLOB AS geom,
+    ST_ASWKB(area_include_geom)::BLOB AS area_include_geom
+  )
 FROM intermediate.firms_to_validate
 WHERE
   @AND(
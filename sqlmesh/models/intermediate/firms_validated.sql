@@ -1,23 +1,45 @@
 MODEL (
-  kind VIEW,
+  kind INCREMENTAL_BY_TIME_RANGE (
+    time_column acq_date,
+    /* validations of earlier dates keep coming in from the retries */
+    lookback @validation_lookback
+  ),
+  grain firms_id,
   audits (
-    NUMBER_OF_ROWS(threshold := 1)
+    NUMBER_OF_ROWS_NON_BLOCKING(threshold := 1)
   )
 );
 
+WITH validated AS (
+  SELECT
+    v.*,
+    f.geom AS geom
+  FROM (
+    @UNION('DISTINCT', @EACH([0, 1, 2], try_ -> intermediate.firms_validated_@{try_}))
+  ) AS v
+  JOIN intermediate.firms AS f
+    ON v.firms_id = f.id
+  LEFT JOIN reference.areas_exclude AS e
+    ON NOT ST_INTERSECTS(f.geom, e.geom)
+  WHERE
+    e.geom IS NULL AND v.acq_date BETWEEN @start_ds AND @end_ds
+  QUALIFY
+    ROW_NUMBER() OVER (PARTITION BY v.firms_id ORDER BY v.validation_try DESC) = 1
+), burnt_buildings AS (
+  /* burnt areas are only returned when buildings are counted locally */
+  SELECT
+    v.firms_id,
+    COUNT(*) AS burnt_building_count
+  FROM validated AS v
+  JOIN reference.open_buildings AS b
+    ON ST_INTERSECTS(b.geom, v.burnt_area)
+  GROUP BY
+    v.firms_id
+)
 SELECT
-  v.*,
-  f.geom AS geom
-FROM (
-  @UNION('DISTINCT', @EACH([0, 1, 2], try_ -> intermediate.firms_validated_@{try_}))
-) AS v
-JOIN intermediate.firms AS f
-  ON v.firms_id = f.id
-LEFT JOIN reference.areas_exclude AS e
-  ON NOT ST_INTERSECTS(f.geom, e.geom)
-WHERE
-  e.geom IS NULL
-QUALIFY
-  ROW_NUMBER() OVER (PARTITION BY v.firms_id ORDER BY v.validation_try DESC) = 1
-ORDER BY
-  v.acq_date
\ No newline at end of file
+  v.* REPLACE (COALESCE(bb.burnt_building_count, v.burnt_building_count) AS burnt_building_count)
+FROM validated AS v
+LEFT JOIN burnt_buildings AS bb
+  ON v.firms_id = bb.firms_id;
+
+@CREATE_SPATIAL_INDEX(@this_model, geom)
@@ -1,5 +1,5 @@
 MODEL (
-  kind VIEW,
+  kind FULL,
   description 'FIRMS events clustered by area and date.',
   grain (area_include_id, event_no),
   audits (
@@ -10,10 +10,10 @@ MODEL (
 WITH detections AS (
   /* Step 1: Compute date differences */
   SELECT
-    f.id,
-    f.acq_date,
-    f.geom,
-    i.id AS area_include_id,
+    v.firms_id AS id,
+    v.acq_date,
+    v.geom,
+    t.area_include_id,
     v.before_date,
     v.after_date,
     v.burn_scar_detected,
@@ -21,13 +21,11 @@ WITH detections AS (
     v.burnt_building_count,
     v.no_data,
     v.too_cloudy,
-    LAG(f.acq_date) OVER (PARTITION BY i.id ORDER BY f.acq_date) AS prev_date,
-    f.acq_date - prev_date AS date_diff
+    LAG(v.acq_date) OVER (PARTITION BY t.area_include_id ORDER BY v.acq_date) AS prev_date,
+    v.acq_date - prev_date AS date_diff
   FROM intermediate.firms_validated AS v
-  JOIN intermediate.firms AS f
-    ON v.firms_id = f.id
-  JOIN reference.areas_include AS i
-    ON ST_INTERSECTS(f.geom, i.geom)
+  JOIN intermediate.firms_to_validate AS t
+    ON v.firms_id = t.firms_id
 ), event_assignments AS (
   /* Step 2: Assign event IDs based on date gaps */
   SELECT
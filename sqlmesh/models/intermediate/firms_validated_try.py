@@ -1,4 +1,5 @@
 import datetime
+import logging
 import typing as t
 from pathlib import Path
 
@@ -6,23 +7,45 @@ import pandas as pd
 from dotenv import load_dotenv
 
 from burnscar.models import FireDetection
-from burnscar.validators.gee import GEEValidator
+from burnscar.validators.cache import RequestCache
+from burnscar.validators.engine import AIMDLimiter, AsyncValidator
+from burnscar.validators.gee import (
+    GEEValidator,
+    ValidationResult,
+    ValidationSummary,
+    complete_validation_params,
+)
+from burnscar.validators.local import ChipStore, LocalValidator
+from burnscar.validators.metrics import (
+    ValidationMetrics,
+    summarize_metrics,
+    write_metrics,
+)
+from burnscar.validators.retry import RetryPolicy
+from burnscar.validators.sharding import ShardedValidator
+from burnscar.validators.store import ResultStore
 from sqlmesh import ExecutionContext, model
 from sqlmesh.core.model import ModelKindName
 
+logger = logging.getLogger(__name__)
+
 COLUMNS = {
-    "firms_id": "int",
+    "firms_id": "bigint",
     "acq_date": "date",
     "before_date": "date",
     "after_date": "date",
     "burn_scar_detected": "bool",
     "burnt_pixel_count": "int",
     "burnt_building_count": "int",
+    "burnt_area": "geometry",
     "no_data": "bool",
     "too_cloudy": "bool",
     "validation_try": "int",
 }
 
+# number of results after which stage metrics are written
+METRICS_BATCH_SIZE = 10_000
+
 KIND = dict(
     name=ModelKindName.INCREMENTAL_BY_UNIQUE_KEY,
     unique_key=("firms_id"),
@@ -35,16 +58,112 @@ def validate(
     start: datetime.datetime,
     end: datetime.datetime,
     firms_to_validate_table: str,
+    s2_scenes_table: str,
     try_: int = 0,
 ) -> t.Generator[pd.DataFrame, None, None]:
-    # fetch data
+    # get validation params
+    validation_params = context.var("validation_params", {})
+    assert isinstance(validation_params, dict), (
+        "Validation params should be a dictionary"
+    )
+    days_around = int(validation_params.get("days_around", 30))
+
+    # fetch data, together with the Sentinel-2 scenes around each detection.
+    # Detections outside of the catalog's range get no image_metadata and are
+    # probed on Earth Engine instead.
     firms_to_validate = context.fetchdf(
         f"""
-        SELECT * FROM {firms_to_validate_table}
-        WHERE acq_date BETWEEN '{start.date()}' AND '{end.date()}'
+        SELECT
+            f.*,
+            CASE
+                WHEN f.acq_date - INTERVAL '{days_around} days'
+                    >= (SELECT MIN(scene_date) FROM {s2_scenes_table})
+                THEN COALESCE(
+                    LIST(
+                        {{
+                            'scene_date': s.scene_date,
+                            'cloudy_pixel_percentage': s.cloudy_pixel_percentage
+                        }}
+                        ORDER BY s.scene_date
+                    ) FILTER (WHERE s.scene_id IS NOT NULL),
+                    []
+                )
+            END AS image_metadata
+        FROM {firms_to_validate_table} AS f
+        LEFT JOIN {s2_scenes_table} AS s
+            ON s.scene_date >= f.acq_date - INTERVAL '{days_around} days'
+            AND s.scene_date < f.acq_date + INTERVAL '{days_around} days'
+            AND ST_INTERSECTS(
+                s.footprint, ST_ENVELOPE(ST_GEOMFROMWKB(f.area_include_geom))
+            )
+        WHERE f.acq_date BETWEEN '{start.date()}' AND '{end.date()}'
+        GROUP BY ALL
         """,
     )
 
+    # parse detections lazily, validators only hold the ones in flight
+    detections = (
+        FireDetection.model_validate(d._asdict())
+        for d in firms_to_validate.itertuples(index=False)
+    )
+
+    validator_backend = context.var("validator_backend", "gee")
+    if validator_backend == "local":
+        validation_results = validate_local(context, detections, validation_params)
+    elif context.var("ee_key_paths"):
+        validation_results = validate_gee_sharded(
+            context, detections, validation_params, try_
+        )
+    else:
+        assert validator_backend == "gee", (
+            f"Unknown validator backend: {validator_backend}"
+        )
+        validation_results = validate_gee(context, detections, validation_params, try_)
+
+    # buffer results in columns and yield them in batches, so they are
+    # inserted in bulk
+    output_batch_size = context.var("output_batch_size", 1000)
+    assert isinstance(output_batch_size, int) and output_batch_size > 0, (
+        "Output batch size should be a positive integer"
+    )
+
+    buffer: dict[str, list] = {column: [] for column in COLUMNS}
+    for validation_result in validation_results:
+        for column, value in validation_result.model_dump().items():
+            if column in buffer:
+                buffer[column].append(value)
+        buffer["validation_try"].append(try_)
+
+        if len(buffer["firms_id"]) >= output_batch_size:
+            yield pd.DataFrame(buffer)
+            buffer = {column: [] for column in COLUMNS}
+
+    if buffer["firms_id"]:
+        yield pd.DataFrame(buffer)
+
+
+def validate_local(
+    context: ExecutionContext,
+    detections: t.Iterable[FireDetection],
+    validation_params: dict,
+) -> t.Generator[ValidationResult | ValidationSummary, None, None]:
+    path_chips = context.var("path_chips")
+    assert path_chips, "path_chips must be set in config for the local backend"
+
+    validator = LocalValidator(ChipStore(path_chips))
+    yield from validator.validate_many(
+        detections,
+        validation_params=validation_params,
+        max_workers=context.var("ee_concurrency", 10),
+    )
+
+
+def validate_gee(
+    context: ExecutionContext,
+    detections: t.Iterable[FireDetection],
+    validation_params: dict,
+    try_: int,
+) -> t.Generator[ValidationResult | ValidationSummary, None, None]:
     # set up validator
     load_dotenv()
     ee_key_path = context.var("ee_key_path")
@@ -52,32 +171,167 @@ def validate(
     ee_key_path = Path(ee_key_path)
     assert ee_key_path.exists(), f"Earth Engine key file is missing: {ee_key_path}"
 
-    validator = GEEValidator(key_path=ee_key_path)
+    ee_cache = context.var("ee_cache", {})
+    assert isinstance(ee_cache, dict), "ee_cache should be a dictionary"
 
-    # get validation params
-    validation_params = context.var("validation_params", {})
-    assert isinstance(validation_params, dict), (
-        "Validation params should be a dictionary"
+    ee_retry = context.var("ee_retry", {})
+    assert isinstance(ee_retry, dict), "ee_retry should be a dictionary"
+
+    # results of earlier runs, so we only validate new detections
+    path_validation_store = context.var("path_validation_store")
+    store = ResultStore(path_validation_store) if path_validation_store else None
+
+    # buildings are either counted on gee, or later against reference.open_buildings
+    validator = GEEValidator(
+        key_path=ee_key_path,
+        cache=RequestCache(**ee_cache),
+        retry_policy=RetryPolicy(**ee_retry),
+        store=store,
+        count_buildings=not context.var("buildings_local", False),
+        metrics=ValidationMetrics(),
+    )
+
+    if store is not None:
+        store.prune(validator.get_validation_params(validation_params))
+
+    ee_concurrency = context.var("ee_concurrency")
+    assert isinstance(ee_concurrency, int), (
+        "Concurrency should be defined in the config and be a positive integer"
+    )
+
+    ee_batch_size = context.var("ee_batch_size")
+    assert ee_batch_size is None or isinstance(ee_batch_size, int), (
+        "Batch size should be a positive integer, or left empty to disable batching"
+    )
+
+    ee_group_detections = bool(context.var("ee_group_detections", False))
+
+    # either adapt concurrency to Earth Engine, up to ee_concurrency threads, or
+    # use a fixed number of threads
+    if context.var("ee_adaptive_concurrency", False):
+        validation_results = AsyncValidator(
+            validator,
+            validation_params=validation_params,
+            limiter=AIMDLimiter(
+                initial=min(10, ee_concurrency), maximum=ee_concurrency
+            ),
+            memory_limit_mb=context.var("ee_memory_limit_mb"),
+        ).validate_many(detections, lean=True)
+
+    else:
+        validation_results = validator.validate_many(
+            detections,
+            validation_params=validation_params,
+            max_workers=ee_concurrency,
+            batch_size=ee_batch_size,
+            group=ee_group_detections,
+            lean=True,
+        )
+
+    metrics_path = get_metrics_path(context, try_)
+    metrics = []
+    for count, validation_result in enumerate(validation_results, start=1):
+        yield validation_result
+
+        if count % METRICS_BATCH_SIZE == 0:
+            metrics.append(
+                record_metrics(validator.metrics.drain(), metrics_path, try_)
+            )
+
+    metrics.append(record_metrics(validator.metrics.drain(), metrics_path, try_))
+    log_metrics(metrics)
+    logger.info(f"Earth Engine request outcomes: {dict(validator.retry_policy.counts)}")
+
+
+def validate_gee_sharded(
+    context: ExecutionContext,
+    detections: t.Iterable[FireDetection],
+    validation_params: dict,
+    try_: int,
+) -> t.Generator[ValidationSummary, None, None]:
+    load_dotenv()
+    ee_key_paths = [Path(path) for path in context.var("ee_key_paths")]
+    for ee_key_path in ee_key_paths:
+        assert ee_key_path.exists(), f"Earth Engine key file is missing: {ee_key_path}"
+
+    ee_cache = context.var("ee_cache", {})
+    assert isinstance(ee_cache, dict), "ee_cache should be a dictionary"
+
+    ee_retry = context.var("ee_retry", {})
+    assert isinstance(ee_retry, dict), "ee_retry should be a dictionary"
+
+    path_validation_store = context.var("path_validation_store")
+    store = ResultStore(path_validation_store) if path_validation_store else None
+
+    validator = ShardedValidator(
+        key_paths=ee_key_paths,
+        store=store,
+        count_buildings=not context.var("buildings_local", False),
+        cache=ee_cache,
+        retry=ee_retry,
     )
 
+    if store is not None:
+        store.prune(
+            complete_validation_params(validation_params, validator.count_buildings)
+        )
+
+    # ee_concurrency applies to each service account
     ee_concurrency = context.var("ee_concurrency")
     assert isinstance(ee_concurrency, int), (
         "Concurrency should be defined in the config and be a positive integer"
     )
 
-    detections = [
-        FireDetection.model_validate(d)
-        for d in firms_to_validate.to_dict(orient="records")
-    ]
+    yield from validator.validate_many(
+        detections,
+        validation_params=validation_params,
+        max_workers=ee_concurrency,
+        batch_size=context.var("ee_batch_size"),
+        group=bool(context.var("ee_group_detections", False)),
+    )
+
+    metrics_path = get_metrics_path(context, try_)
+    log_metrics(
+        [
+            record_metrics(metrics_df, metrics_path, try_)
+            for metrics_df in validator.metrics
+        ]
+    )
+    logger.info(f"Earth Engine request outcomes: {dict(validator.retry_counts)}")
+
+
+def get_metrics_path(context: ExecutionContext, try_: int) -> Path | None:
+    """
+    A csv file per model run in path_metrics, the metrics are kept out of the
+    warehouse so they don't bypass SQLMesh's environments.
+    """
+    path_metrics = context.var("path_metrics")
+    if not path_metrics:
+        return None
+
+    run_at = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+    return Path(path_metrics) / f"validation_runs_{run_at}_try{try_}.csv"
+
+
+def record_metrics(
+    metrics_df: pd.DataFrame,
+    path: Path | None,
+    try_: int,
+) -> pd.DataFrame:
+    """Write stage metrics to the metrics file, if any, and return them."""
+    metrics_df["validation_try"] = try_
+    if path is not None:
+        write_metrics(metrics_df, path)
+
+    return metrics_df
 
-    for validation_result in validator.validate_many(
-        detections, validation_params=validation_params, max_workers=ee_concurrency
-    ):
-        validation_result_dict = validation_result.model_dump()
-        result_df = pd.DataFrame([validation_result_dict])
-        result_df["validation_try"] = try_
 
-        yield result_df
+def log_metrics(metrics: list[pd.DataFrame]):
+    metrics = [metrics_df for metrics_df in metrics if not metrics_df.empty]
+    if metrics:
+        logger.info(
+            f"Validation stage metrics:\n{summarize_metrics(pd.concat(metrics))}"
+        )
 
 
 @model(
@@ -92,12 +346,14 @@ def firms_validated_try_0(
     **kwargs: dict[str, t.Any],
 ) -> t.Generator[pd.DataFrame, None, None]:
     firms_to_validate_table = context.resolve_table("intermediate.firms_to_validate_0")
+    s2_scenes_table = context.resolve_table("reference.s2_scenes")
 
     yield from validate(
         context=context,
         start=start,
         end=end,
         firms_to_validate_table=firms_to_validate_table,
+        s2_scenes_table=s2_scenes_table,
         try_=0,
     )
 
@@ -114,12 +370,14 @@ def firms_validated_try_1(
     **kwargs: dict[str, t.Any],
 ) -> t.Generator[pd.DataFrame, None, None]:
     firms_to_validate_table = context.resolve_table("intermediate.firms_to_validate_1")
+    s2_scenes_table = context.resolve_table("reference.s2_scenes")
 
     yield from validate(
         context=context,
         start=start,
         end=end,
         firms_to_validate_table=firms_to_validate_table,
+        s2_scenes_table=s2_scenes_table,
         try_=1,
     )
 
@@ -136,11 +394,13 @@ def firms_validated_try_2(
     **kwargs: dict[str, t.Any],
 ) -> t.Generator[pd.DataFrame, None, None]:
     firms_to_validate_table = context.resolve_table("intermediate.firms_to_validate_2")
+    s2_scenes_table = context.resolve_table("reference.s2_scenes")
 
     yield from validate(
         context=context,
         start=start,
         end=end,
         firms_to_validate_table=firms_to_validate_table,
+        s2_scenes_table=s2_scenes_table,
         try_=2,
     )
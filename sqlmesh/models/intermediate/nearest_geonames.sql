@@ -1,10 +1,10 @@
 MODEL (
   name intermediate.nearest_geonames_@{source_table},
   description 'Find the nearest geoname settlement for each FIRMS event.',
-  kind VIEW,
+  kind FULL,
+  /* detections get their nearest settlement in firms_to_validate */
   blueprints (
-    (source_table := firms_validated_clustered, id_col := area_include_id),
-    (source_table := firms_validated, id_col := firms_id)
+    (source_table := firms_validated_clustered, id_col := area_include_id)
   ),
   audits (
     NUMBER_OF_ROWS(threshold := 1)
@@ -1,5 +1,5 @@
 MODEL (
-  kind VIEW,
+  kind FULL,
   description 'Final output of the pipeline, including all relevant information for each FIRMS event.',
   audits (
     NUMBER_OF_ROWS(threshold := 1)
@@ -7,17 +7,17 @@ MODEL (
 );
 
 SELECT
-  f.id AS firms_id,
-  ST_Y(f.geom)::DOUBLE AS latitude,
-  ST_X(f.geom)::DOUBLE AS longitude,
-  f.acq_date,
-  g.country_id,
-  g.gadm_1,
-  @IF(@gadm_level >= 2, g.gadm_2),
-  @IF(@gadm_level >= 3, g.gadm_3),
-  ng.settlement_name,
-  ng.settlement_distance,
-  i.id AS area_include_id,
+  v.firms_id,
+  ST_Y(v.geom)::DOUBLE AS latitude,
+  ST_X(v.geom)::DOUBLE AS longitude,
+  v.acq_date,
+  t.country_id,
+  t.gadm_1,
+  @IF(@gadm_level >= 2, t.gadm_2),
+  @IF(@gadm_level >= 3, t.gadm_3),
+  t.settlement_name,
+  t.settlement_distance,
+  t.area_include_id,
   fvc.event_no,
   v.before_date,
   v.after_date,
@@ -27,20 +27,15 @@ SELECT
   v.burn_scar_detected,
   v.burnt_pixel_count,
   v.burnt_building_count
-FROM intermediate.firms AS f
-JOIN reference.areas_include AS i
-  ON ST_INTERSECTS(f.geom, i.geom)
-JOIN intermediate.firms_validated AS v
-  ON f.id = v.firms_id
+FROM intermediate.firms_validated AS v
+/* area, GADM and settlement attributes were looked up with the detection */
+JOIN intermediate.firms_to_validate AS t
+  ON v.firms_id = t.firms_id
 JOIN intermediate.firms_validated_clustered AS fvc
-  ON i.id = fvc.area_include_id
-  AND f.acq_date >= fvc.start_date
-  AND f.acq_date <= fvc.end_date
-LEFT JOIN intermediate.nearest_geonames_firms_validated AS ng
-  ON f.id = ng.firms_id
-JOIN reference.gadm AS g
-  ON ST_INTERSECTS(f.geom, g.geom)
+  ON t.area_include_id = fvc.area_include_id
+  AND v.acq_date >= fvc.start_date
+  AND v.acq_date <= fvc.end_date
 ORDER BY
-  i.id,
+  t.area_include_id,
   fvc.event_no,
-  f.acq_date
\ No newline at end of file
+  v.acq_date
@@ -1,5 +1,5 @@
 MODEL (
-  kind VIEW,
+  kind FULL,
   description 'Final output of the pipeline, clustered by area and date.',
   audits (
     NUMBER_OF_ROWS(threshold := 1)
@@ -0,0 +1,74 @@
+MODEL (
+  kind FULL,
+  /* GADM hardly changes, and a plan that changes it rebuilds the mask as well */
+  cron '@yearly',
+  description 'Dissolved and simplified GADM geometry of the country, split into grid cells so point in polygon tests only see a small polygon, with the extent of the whole country',
+  audits (
+    NUMBER_OF_ROWS(threshold := 1)
+  )
+);
+
+WITH country AS (
+  SELECT
+    ST_SIMPLIFYPRESERVETOPOLOGY(ST_UNION_AGG(geom), @country_mask_tolerance) AS geom
+  FROM reference.gadm
+), extent AS (
+  SELECT
+    geom,
+    ST_XMIN(geom) AS min_x,
+    ST_YMIN(geom) AS min_y,
+    ST_XMAX(geom) AS max_x,
+    ST_YMAX(geom) AS max_y
+  FROM country
+), xs AS (
+  SELECT
+    UNNEST(
+      GENERATE_SERIES(0, GREATEST(CEIL((max_x - min_x) / @country_mask_cell_size)::BIGINT - 1, 0))
+    ) AS x
+  FROM extent
+), ys AS (
+  SELECT
+    UNNEST(
+      GENERATE_SERIES(0, GREATEST(CEIL((max_y - min_y) / @country_mask_cell_size)::BIGINT - 1, 0))
+    ) AS y
+  FROM extent
+), cell_boxes AS (
+  SELECT
+    e.*,
+    ST_MAKEENVELOPE(
+      e.min_x + xs.x * @country_mask_cell_size,
+      e.min_y + ys.y * @country_mask_cell_size,
+      e.min_x + (xs.x + 1) * @country_mask_cell_size,
+      e.min_y + (ys.y + 1) * @country_mask_cell_size
+    ) AS cell
+  FROM extent AS e
+  CROSS JOIN xs
+  CROSS JOIN ys
+), parts AS (
+  SELECT
+    ST_INTERSECTION(b.geom, b.cell) AS geom,
+    b.min_x,
+    b.min_y,
+    b.max_x,
+    b.max_y
+  FROM cell_boxes AS b
+  WHERE
+    ST_INTERSECTS(b.geom, b.cell)
+)
+SELECT
+  geom::GEOMETRY AS geom, /* part of the country within a grid cell */
+  ST_XMIN(geom) AS cell_min_x, /* extent of the part, to prefilter joins on */
+  ST_YMIN(geom) AS cell_min_y,
+  ST_XMAX(geom) AS cell_max_x,
+  ST_YMAX(geom) AS cell_max_y,
+  min_x, /* extent of the whole country */
+  min_y,
+  max_x,
+  max_y
+FROM parts
+WHERE
+  NOT ST_ISEMPTY(geom);
+
+/* DuckDB only uses the RTREE index for filters against a constant geometry, */
+/* joins prefilter on the extent of each part instead */
+@CREATE_SPATIAL_INDEX(@this_model, geom)
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from sqlglot import exp
+from sqlmesh.core.macros import MacroEvaluator
+from sqlmesh.core.model import ModelKindName
+
+from burnscar.fetchers.open_buildings import ensure_open_buildings
+from sqlmesh import model
+
+EMPTY = (
+    "select null::geometry as geom, null::double as confidence, "
+    "null::double as area_in_meters limit 0"
+)
+
+
+@model(
+    kind=ModelKindName.FULL,
+    is_sql=True,
+    # the footprints are only refreshed once in a while, they take GBs to load
+    cron="@yearly",
+    description="Open Buildings footprints within the country extent, used to count burnt buildings locally.",
+    depends_on=["reference.country_mask"],
+    post_statements=[
+        "@CREATE_SPATIAL_INDEX(@this_model, geom)",
+    ],
+)
+def open_buildings(evaluator: MacroEvaluator) -> str | exp.Expression:
+    # buildings are only needed when counted locally, and the tiles are only
+    # downloaded when the model is evaluated
+    if (
+        not evaluator.var("buildings_local", False)
+        or evaluator.runtime_stage != "evaluating"
+    ):
+        return EMPTY
+
+    path_open_buildings = evaluator.var("path_open_buildings")
+    assert path_open_buildings and isinstance(path_open_buildings, str), (
+        "path_open_buildings not set in config"
+    )
+
+    country_mask = evaluator.resolve_table("reference.country_mask")
+    row = evaluator.engine_adapter.fetchone(
+        f"select min_x, min_y, max_x, max_y from {country_mask} limit 1"
+    )
+    assert row, "reference.country_mask is empty"
+    box = dict(zip(("min_x", "min_y", "max_x", "max_y"), row))
+
+    tile_paths = ensure_open_buildings(path=Path(path_open_buildings), box=box)
+    if not tile_paths:
+        return EMPTY
+
+    # same confidence threshold as the buildings used on gee
+    return f"""
+        SELECT
+            ST_GEOMFROMTEXT(geometry) AS geom,
+            confidence::DOUBLE AS confidence,
+            area_in_meters::DOUBLE AS area_in_meters
+        FROM read_csv([{", ".join(f"'{path}'" for path in tile_paths)}])
+        WHERE
+            confidence >= 0.75
+            AND longitude BETWEEN {box["min_x"]} AND {box["max_x"]}
+            AND latitude BETWEEN {box["min_y"]} AND {box["max_y"]}
+    """
@@ -0,0 +1,64 @@
+import datetime
+import typing as t
+from pathlib import Path
+
+import pandas as pd
+from sqlmesh.core.model import ModelKindName
+
+from burnscar.fetchers.sentinel import fetch_s2_catalog
+from burnscar.utils import date_range
+from burnscar.validators.gee import initialize
+from sqlmesh import ExecutionContext, model
+
+
+@model(
+    kind=dict(
+        name=ModelKindName.INCREMENTAL_BY_TIME_RANGE,
+        time_column="scene_date",
+        lookback="@validation_lookback",
+    ),
+    cron="@daily",
+    grain=("scene_id",),
+    description="Sentinel-2 scene catalog (footprint, date, cloud cover) for the country extent.",
+    columns={
+        "scene_id": "text",
+        "scene_date": "date",
+        "cloudy_pixel_percentage": "double",
+        "footprint": "geometry",
+    },
+    post_statements=[
+        "@CREATE_SPATIAL_INDEX(@this_model, footprint)",
+    ],
+)
+def s2_scenes(
+    context: ExecutionContext,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    **kwargs: dict[str, t.Any],
+) -> t.Generator[pd.DataFrame, None, None]:
+    # the local validator reads the imagery of its chips, without Earth Engine
+    if context.var("validator_backend", "gee") == "local":
+        yield from ()
+        return
+
+    ee_key_path = context.var("ee_key_path")
+    assert ee_key_path, "ee_key_path must be set in config"
+    ee_key_path = Path(ee_key_path)
+    assert ee_key_path.exists(), f"Earth Engine key file is missing: {ee_key_path}"
+
+    initialize(ee_key_path)
+
+    gadm = context.resolve_table("reference.gadm")
+    box = context.fetchdf(
+        f"select st_extent(ST_Union_Agg(geom)) as box from {gadm}",
+    )["box"][0]
+
+    scenes = []
+    for date in date_range(start.date(), end.date()):
+        scenes += fetch_s2_catalog(box, date)
+
+    if not scenes:
+        yield from ()
+
+    else:
+        yield pd.DataFrame(scenes)
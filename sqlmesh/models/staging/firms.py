@@ -5,9 +5,12 @@ import typing as t
 import duckdb
 import pandas as pd
 from dotenv import load_dotenv
+from shapely import GeometryCollection, from_wkb
 from sqlmesh.core.model import ModelKindName
 
-from burnscar.fetchers.nasa import NASAFetcher
+from burnscar.fetchers.cache import ResponseCache
+from burnscar.fetchers.nasa import NASAFetcher, parse_interval
+from burnscar.tiling import plan_tiles
 from burnscar.utils import date_range
 from sqlmesh import ExecutionContext, model
 
@@ -16,7 +19,7 @@ from sqlmesh import ExecutionContext, model
     kind=dict(
         name=ModelKindName.INCREMENTAL_BY_TIME_RANGE,
         time_column="acq_date",
-        batch_size=1,
+        batch_size=10,
     ),
     cron="@daily",
     grain=("acq_date", "longitude", "latitude"),
@@ -47,34 +50,53 @@ def nasa_firms(
     **kwargs: dict[str, t.Any],
 ) -> t.Generator[pd.DataFrame, None, None]:
     load_dotenv()
+    offline = context.var("firms_offline", False)
     api_key_nasa = os.getenv("NASA_API_KEY")
-    assert api_key_nasa, "NASA API key not set in .env file"
+    assert api_key_nasa or offline, "NASA API key not set in .env file"
 
     country_id = context.var("country_id")
     assert country_id, "Country code must be set in the context variables"
 
-    gadm = context.resolve_table("reference.gadm")
-    box = context.fetchdf(
-        f"select st_extent(ST_Union_Agg(geom)) as box from {gadm}",
-    )["box"][0]
+    country_mask = context.resolve_table("reference.country_mask")
+    boxes = get_fetch_boxes(context, country_mask)
 
-    fetcher = NASAFetcher(api_key=api_key_nasa)
+    cache = None
+    if path_cache := context.var("path_firms_cache"):
+        cache = ResponseCache(
+            path_cache,
+            ttl=parse_interval(context.var("firms_cache_ttl", "6 hours")),
+            offline=offline,
+        )
+    assert cache or not offline, "Offline mode needs path_firms_cache to be set"
 
-    dfs = []
-    dates = date_range(start.date(), end.date())
-
-    for date in dates:
-        data = fetcher.fetch(box, date)
-        dfs.append(fetcher.to_dataframe(data))
+    fetcher = NASAFetcher(api_key=api_key_nasa or "", cache=cache)
 
-    df = pd.concat(dfs, ignore_index=True)
+    dates = date_range(start.date(), end.date())
+    df = pd.concat(
+        [
+            fetcher.fetch_many_df(
+                box, dates, max_workers=context.var("nasa_concurrency", 6)
+            )
+            for box in boxes
+        ],
+        ignore_index=True,
+    )
+    if len(boxes) > 1:
+        # detections on the edge of neighbouring tiles are in both
+        df = df.drop_duplicates(ignore_index=True)
 
+    # the join doesn't use the RTREE index on the mask, the range conditions on
+    # the extent of each part let DuckDB pair detections with the few parts
+    # around them before the point in polygon tests
     df = duckdb.query(
         f"""
         load spatial;
-        select '{country_id}' as country_id, *
+        select '{country_id}' as country_id, df.*
         from df
-        where st_within(st_point(longitude, latitude), (select ST_Union_Agg(geom) from {gadm}))
+        semi join {country_mask} as m
+            on df.longitude between m.cell_min_x and m.cell_max_x
+            and df.latitude between m.cell_min_y and m.cell_max_y
+            and st_intersects(m.geom, st_point(df.longitude, df.latitude))
         """,
         connection=context.engine_adapter.connection,
     ).df()
@@ -83,4 +105,36 @@ def nasa_firms(
         yield from ()
 
     else:
-        yield df
+        # one batch per date, like the intervals of this model
+        for _, date_df in df.groupby("acq_date", sort=True):
+            yield date_df
+
+
+def get_fetch_boxes(
+    context: ExecutionContext, country_mask: str
+) -> list[dict[str, float]]:
+    """
+    Boxes to fetch, covering the country or the include areas with tiles of
+    `firms_tile_size` degrees, or the extent of the country without a tile size.
+    """
+    tile_size = context.var("firms_tile_size")
+    if not tile_size:
+        return [
+            context.fetchdf(
+                f"select min_x, min_y, max_x, max_y from {country_mask} limit 1",
+            )
+            .iloc[0]
+            .to_dict()
+        ]
+
+    if context.var("firms_tiles_within", "gadm") == "areas_include":
+        areas_include = context.resolve_table("reference.areas_include")
+        query = f"select st_aswkb(ST_Union_Agg(geom)) as geom from {areas_include}"
+    else:
+        # the parts of the mask, without dissolving them again
+        query = f"select st_aswkb(geom) as geom from {country_mask}"
+
+    geoms = [from_wkb(bytes(geom)) for geom in context.fetchdf(query)["geom"] if geom]
+    assert geoms, "No geometry to plan tiles for"
+
+    return plan_tiles(GeometryCollection(geoms), tile_size=float(tile_size))
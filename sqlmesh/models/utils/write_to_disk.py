@@ -9,7 +9,7 @@ from sqlmesh.core.model import ModelKindName
 @model(
     kind=ModelKindName.FULL,
     description="Final outputs: output.csv (with added social links), output_clustered.csv (clusters of detections)",
-    columns={"firms_id": "int"},
+    columns={"firms_id": "bigint"},
     enabled=False,
 )
 def write_outputs_to_disk(
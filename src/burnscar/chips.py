@@ -0,0 +1,289 @@
+import datetime
+import logging
+import typing as t
+from enum import StrEnum
+from functools import partial
+from pathlib import Path
+
+import ee
+import httpx
+import numpy as np
+from ee.geometry import Geometry
+from ee.image import Image
+from ee.reducer import Reducer
+
+from .models import FireDetection
+from .utils import date_from_millis, map_bounded
+from .validators.gee import GEEValidator, ImagerySelection, initialize
+from .validators.grouping import METERS_PER_DEGREE
+from .validators.local import SCALE, Chip, ChipStore
+from .validators.retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+RGB_VISUALIZATION = {"bands": ["B4", "B3", "B2"], "min": 0, "max": 3000}
+BURNT_AREA_VISUALIZATION = {"min": 0, "max": 1, "palette": ["ff0000"]}
+
+
+class ChipFormat(StrEnum):
+    png = "png"
+    geotiff = "geotiff"
+
+
+class ChipRequest(FireDetection):
+    before_date: datetime.date
+    after_date: datetime.date
+
+
+class ChipExporter:
+    """
+    Export before, after and burnt area chips of validated detections from
+    Earth Engine, for reviewing them without opening each one in a browser.
+
+    Chips show the images the validation analysed, from the collection of the
+    detection's include area. They are downloaded concurrently through
+    thumbnail (png) or download (GeoTIFF) urls, and cached on disk by FIRMS ID
+    and date, so reruns skip chips that were already exported.
+    """
+
+    def __init__(
+        self,
+        key_path: Path,
+        path: Path,
+        file_format: ChipFormat = ChipFormat.png,
+        buffer_distance: int = 1000,
+        max_cloudy_percentage: int = 20,
+        max_nbr_after: float = -0.10,
+        min_nbr_difference: float = 0.15,
+        dimensions: int = 512,
+        retry_policy: RetryPolicy | None = None,
+    ):
+        initialize(key_path)
+        self.path = path
+        self.file_format = ChipFormat(file_format)
+        self.buffer_distance = buffer_distance
+        self.max_cloudy_percentage = max_cloudy_percentage
+        self.max_nbr_after = max_nbr_after
+        self.min_nbr_difference = min_nbr_difference
+        self.dimensions = dimensions
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    def export_many(
+        self,
+        requests: t.Iterable[ChipRequest],
+        max_workers: int = 10,
+    ) -> t.Generator[list[Path], None, None]:
+        def safe_export(request: ChipRequest) -> list[Path]:
+            try:
+                return self.export(request)
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"Chip export failed for FIRMS ID {request.firms_id}: {e}")
+                return []
+
+        yield from map_bounded(safe_export, requests, max_workers)
+
+    def export(self, request: ChipRequest) -> list[Path]:
+        suffix = "png" if self.file_format == ChipFormat.png else "tif"
+        chip_path = self.path / f"{request.firms_id}_{request.acq_date}"
+        paths = {
+            "before": chip_path / f"before_{request.before_date}.{suffix}",
+            "after": chip_path / f"after_{request.after_date}.{suffix}",
+            "burnt_area": chip_path
+            / f"burnt_area_{request.before_date}_{request.after_date}.{suffix}",
+        }
+        if all(path.exists() for path in paths.values()):
+            return list(paths.values())
+
+        # same images and burnt area as the validation
+        ee_aoi_bounds = GEEValidator._get_ee_aoi_bounds(request, self.buffer_distance)
+        before_image, after_image = GEEValidator._get_selected_images(
+            request.area_include_geom,
+            ee_aoi_bounds,
+            ImagerySelection(
+                before_date=request.before_date, after_date=request.after_date
+            ),
+            self.max_cloudy_percentage,
+        )
+        nbr_difference = GEEValidator._get_nbr_difference(before_image, after_image)
+        nbr_mask = GEEValidator._get_nbr_mask(
+            after_image, nbr_difference, self.max_nbr_after, self.min_nbr_difference
+        )
+
+        images = {
+            "before": (before_image, RGB_VISUALIZATION),
+            "after": (after_image, RGB_VISUALIZATION),
+            "burnt_area": (nbr_mask.selfMask(), BURNT_AREA_VISUALIZATION),
+        }
+
+        chip_path.mkdir(parents=True, exist_ok=True)
+        for name, path in paths.items():
+            if path.exists():
+                continue
+
+            image, visualization = images[name]
+            url = self.retry_policy.call(
+                partial(self._get_url, image, visualization, ee_aoi_bounds)
+            )
+            path.write_bytes(self.retry_policy.call(partial(self._download, url)))
+
+        return list(paths.values())
+
+    def _get_url(
+        self,
+        image: Image,
+        visualization: dict[str, t.Any],
+        region: Geometry,
+    ) -> str:
+        if self.file_format == ChipFormat.png:
+            return image.getThumbURL(
+                {
+                    **visualization,
+                    "region": region,
+                    "dimensions": self.dimensions,
+                    "format": "png",
+                }
+            )
+
+        return image.visualize(**visualization).getDownloadURL(
+            {"region": region, "scale": 10, "format": "GEO_TIFF"}
+        )
+
+    @staticmethod
+    def _download(url: str) -> bytes:
+        response = httpx.get(url, timeout=60, follow_redirects=True)
+        response.raise_for_status()
+        return response.content
+
+
+def to_chip(pixels: np.ndarray, image_metadata: list[list[float]]) -> Chip:
+    """
+    Chip from the pixels of a collection of B8 and B12 bands stacked with
+    `toBands()`, and the `[system:time_start, CLOUDY_PIXEL_PERCENTAGE]` of each
+    of its images, in the same order.
+    """
+    assert pixels.dtype.names is not None, "Expected a structured array of bands"
+
+    band_names = pixels.dtype.names
+    return Chip(
+        dates=[date_from_millis(ts) for ts, _ in image_metadata],
+        cloudy_pixel_percentage=[
+            cloudy_pixel_percentage for _, cloudy_pixel_percentage in image_metadata
+        ],
+        b8=np.stack([pixels[name] for name in band_names if name.endswith("_B8")]),
+        b12=np.stack([pixels[name] for name in band_names if name.endswith("_B12")]),
+        buildings=pixels["buildings"] if "buildings" in band_names else None,
+    )
+
+
+class BandChipExporter:
+    """
+    Export the Sentinel-2 bands around detections from Earth Engine as NPZ
+    chips, for the `local` validator backend.
+
+    Chips hold B8 and B12 of every image in the collection the validation
+    selects imagery from, on a 10 meter grid centered on the detection, with a
+    raster of Open Buildings ids. Detections that already have a chip are
+    skipped.
+    """
+
+    def __init__(
+        self,
+        key_path: Path,
+        chip_store: ChipStore,
+        buffer_distance: int = 1000,
+        days_around: int = 30,
+        count_buildings: bool = True,
+        retry_policy: RetryPolicy | None = None,
+    ):
+        initialize(key_path)
+        self.chip_store = chip_store
+        self.buffer_distance = buffer_distance
+        self.days_around = days_around
+        self.count_buildings = count_buildings
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    def export_many(
+        self,
+        detections: t.Iterable[FireDetection],
+        max_workers: int = 10,
+    ) -> t.Generator[bool, None, None]:
+        def safe_export(detection: FireDetection) -> bool:
+            try:
+                return self.export(detection)
+            except Exception as e:  # noqa: BLE001
+                logger.error(
+                    f"Chip export failed for FIRMS ID {detection.firms_id}: {e}"
+                )
+                return False
+
+        yield from map_bounded(safe_export, detections, max_workers)
+
+    def export(self, detection: FireDetection) -> bool:
+        if self.chip_store.exists(detection.firms_id, detection.acq_date):
+            return True
+
+        # same collection as the validation selects imagery from
+        s2 = GEEValidator._get_s2_collection(detection, self.days_around).select(
+            ["B8", "B12"]
+        )
+        image_metadata = self.retry_policy.call(
+            lambda: (
+                s2.reduceColumns(
+                    reducer=Reducer.toList(2),
+                    selectors=["system:time_start", "CLOUDY_PIXEL_PERCENTAGE"],
+                )
+                .get("list")
+                .getInfo()
+            )
+        )
+        if not image_metadata:
+            logger.warning(f"No imagery for FIRMS ID {detection.firms_id}")
+            return False
+
+        image = s2.toBands()
+        if self.count_buildings:
+            image = image.addBands(self._get_buildings_raster(detection))
+
+        grid = self._get_grid(detection)
+        pixels = self.retry_policy.call(
+            lambda: ee.data.computePixels(
+                {"expression": image, "fileFormat": "NUMPY_NDARRAY", "grid": grid}
+            )
+        )
+
+        self.chip_store.save(
+            detection.firms_id, detection.acq_date, to_chip(pixels, image_metadata)
+        )
+        return True
+
+    def _get_grid(self, detection: FireDetection) -> dict[str, t.Any]:
+        """Square grid of `SCALE` meter pixels covering the buffer."""
+        x, y = detection.geom.x, detection.geom.y
+        size = 2 * round(self.buffer_distance / SCALE)
+        scale_y = SCALE / METERS_PER_DEGREE
+        scale_x = scale_y / np.cos(np.radians(y))
+        return {
+            "dimensions": {"width": size, "height": size},
+            "affineTransform": {
+                "scaleX": scale_x,
+                "shearX": 0,
+                "translateX": x - size / 2 * scale_x,
+                "shearY": 0,
+                "scaleY": -scale_y,
+                "translateY": y + size / 2 * scale_y,
+            },
+            "crsCode": "EPSG:4326",
+        }
+
+    def _get_buildings_raster(self, detection: FireDetection) -> Image:
+        """Buildings in the buffer, burnt in with a random id per building."""
+        buildings = GEEValidator._get_buildings(
+            GEEValidator._get_ee_aoi_bounds(detection, self.buffer_distance)
+        ).randomColumn("building_id")
+        return (
+            buildings.reduceToImage(["building_id"], Reducer.first())
+            .multiply(2**31)
+            .toInt64()
+            .unmask(0)
+            .rename("buildings")
+        )
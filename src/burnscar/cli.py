@@ -7,6 +7,7 @@ import typer
 from sqlmesh.core.context import Context
 
 from . import linkgen
+from .chips import BandChipExporter, ChipExporter, ChipFormat, ChipRequest
 
 app = typer.Typer(name="burnscar", help="CLI for Burnscar, a SQLMesh project.")
 
@@ -42,14 +43,14 @@ def run():
 
 @app.command()
 def export(
-    path: Path = typer.Option(None), add_links: bool = typer.Option(False)
+    path: Path | None = typer.Option(None), add_links: bool = typer.Option(False)
 ) -> None:
     ensure_sqlmesh_root()
     context = Context(paths=["."])
     engine = context.engine_adapter
 
     if not path:
-        path = context.config.variables.get("path_output")
+        path = Path(context.config.variables["path_output"])
 
     try:
         with engine.connection as conn:
@@ -83,5 +84,174 @@ def export(
         raise e
 
 
+@app.command()
+def chips(
+    path: Path | None = typer.Option(None, help="Defaults to `chips` in path_output"),
+    file_format: ChipFormat = typer.Option(ChipFormat.png, "--format"),
+    burn_scars_only: bool = typer.Option(True),
+    max_workers: int = typer.Option(10),
+) -> None:
+    """
+    Export before, after and burnt area chips of validated detections.
+    """
+    ensure_sqlmesh_root()
+    context = Context(paths=["."])
+    variables = context.config.variables
+
+    if not path:
+        path = Path(variables["path_output"]) / "chips"
+
+    table = context.resolve_table("mart.firms_validated")
+    firms_to_validate = context.resolve_table("intermediate.firms_to_validate")
+    rows = context.fetchdf(
+        f"""
+        SELECT
+            v.firms_id,
+            v.acq_date,
+            ST_ASWKB(t.geom)::BLOB AS geom,
+            ST_ASWKB(t.area_include_geom)::BLOB AS area_include_geom,
+            v.area_include_id,
+            v.before_date,
+            v.after_date
+        FROM {table} AS v
+        JOIN {firms_to_validate} AS t
+            ON v.firms_id = t.firms_id
+            AND v.area_include_id = t.area_include_id
+        WHERE v.before_date IS NOT NULL
+        {"AND v.burn_scar_detected" if burn_scars_only else ""}
+        """
+    )
+
+    validation_params = variables.get("validation_params", {})
+    exporter = ChipExporter(
+        key_path=Path(variables["ee_key_path"]),
+        path=path,
+        file_format=file_format,
+        **{
+            key: value
+            for key, value in validation_params.items()
+            if key
+            in (
+                "buffer_distance",
+                "max_cloudy_percentage",
+                "max_nbr_after",
+                "min_nbr_difference",
+            )
+        },
+    )
+
+    requests = (
+        ChipRequest.model_validate(row) for row in rows.to_dict(orient="records")
+    )
+    exported = sum(
+        1 for paths in exporter.export_many(requests, max_workers=max_workers) if paths
+    )
+
+    typer.secho(f"Exported chips of {exported} detections to {path}", fg="green")
+
+
+@app.command()
+def local_chips(
+    path: Path | None = typer.Option(None, help="Defaults to path_chips"),
+    max_workers: int = typer.Option(10),
+) -> None:
+    """
+    Export the Sentinel-2 chips the local validator backend validates on, for
+    the detections to validate.
+    """
+    from .models import FireDetection
+    from .validators.local import ChipStore
+
+    ensure_sqlmesh_root()
+    context = Context(paths=["."])
+    variables = context.config.variables
+
+    if not path:
+        path = Path(variables["path_chips"])
+
+    table = context.resolve_table("intermediate.firms_to_validate")
+    rows = context.fetchdf(
+        f"""
+        SELECT
+            firms_id,
+            acq_date,
+            ST_ASWKB(geom)::BLOB AS geom,
+            ST_ASWKB(area_include_geom)::BLOB AS area_include_geom,
+            area_include_id
+        FROM {table}
+        """
+    )
+
+    validation_params = variables.get("validation_params", {})
+    exporter = BandChipExporter(
+        key_path=Path(variables["ee_key_path"]),
+        chip_store=ChipStore(path),
+        buffer_distance=validation_params.get("buffer_distance", 1000),
+        days_around=validation_params.get("days_around", 30),
+    )
+
+    detections = (
+        FireDetection.model_validate(row) for row in rows.to_dict(orient="records")
+    )
+    exported = sum(exporter.export_many(detections, max_workers=max_workers))
+
+    typer.secho(f"Exported chips of {exported} detections to {path}", fg="green")
+
+
+@app.command()
+def benchmark(
+    detections_path: Path = typer.Argument(
+        ...,
+        help="csv export of intermediate.firms_to_validate, with hex WKB geometries",
+    ),
+    fixtures: Path = typer.Option(
+        Path("fixtures"), help="Directory with recorded Earth Engine responses"
+    ),
+    record: bool = typer.Option(
+        False, help="Record responses from Earth Engine first, needs --key-path"
+    ),
+    key_path: Path = typer.Option(None),
+    concurrency: list[int] = typer.Option([1, 10, 50]),
+    latency: float = typer.Option(
+        None, help="Seconds per request, defaults to the recorded latency"
+    ),
+    jitter: float = typer.Option(0.0, help="Random extra seconds per request"),
+) -> None:
+    """
+    Benchmark the validator on recorded Earth Engine responses, without
+    credentials or network.
+    """
+    from .validators import benchmark as validator_benchmark
+
+    ensure_sqlmesh_root()
+    context = Context(paths=["."])
+    validation_params = context.config.variables.get("validation_params", {})
+
+    detections = validator_benchmark.read_detections(detections_path)
+
+    if record:
+        if key_path is None:
+            typer.secho("Recording needs --key-path", err=True, fg="red")
+            raise typer.Exit(1)
+
+        round_trips = validator_benchmark.record(
+            key_path, fixtures, detections, validation_params
+        )
+        typer.echo(f"Recorded {round_trips} responses to {fixtures}")
+
+    results = validator_benchmark.run_benchmark(
+        fixtures,
+        detections,
+        validation_params,
+        concurrency_levels=concurrency,
+        latency=latency,
+        jitter=jitter,
+    )
+
+    typer.echo(validator_benchmark.HEADER)
+    for result in results:
+        typer.echo(str(result))
+
+
 if __name__ == "__main__":
     app()
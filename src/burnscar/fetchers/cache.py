@@ -0,0 +1,94 @@
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# data versions that are not reprocessed once published
+FINAL_DATA_VERSIONS = ("SP",)
+
+
+class ResponseCache:
+    """
+    Gzipped raw FIRMS responses on disk, one file per satellite, data version,
+    box and date.
+
+    Responses of finalized data versions are kept for good. Near real time
+    responses keep changing while detections come in, so they expire after
+    `ttl` seconds, unless they were fetched `settle_days` after the date they
+    cover. In `offline` mode nothing expires, so a pipeline can be rebuilt from
+    whatever was cached.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        ttl: float = 6 * 60 * 60,
+        settle_days: int = 2,
+        offline: bool = False,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.settle_days = settle_days
+        self.offline = offline
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(
+        satellite: str,
+        data_version: str,
+        box: dict[str, float],
+        date: datetime.date,
+    ) -> str:
+        request = [satellite, data_version, sorted(box.items()), str(date)]
+        return hashlib.sha256(json.dumps(request).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.csv.gz"
+
+    def _is_expired(self, path: Path, data_version: str, date: datetime.date) -> bool:
+        if self.offline or data_version in FINAL_DATA_VERSIONS:
+            return False
+
+        fetched_at = path.stat().st_mtime
+        settled_at = datetime.datetime.combine(
+            date + datetime.timedelta(days=self.settle_days), datetime.time()
+        ).timestamp()
+
+        return fetched_at < settled_at and time.time() - fetched_at > self.ttl
+
+    def get(
+        self,
+        satellite: str,
+        data_version: str,
+        box: dict[str, float],
+        date: datetime.date,
+    ) -> str | None:
+        path = self._path(self.key(satellite, data_version, box, date))
+        if not path.exists() or self._is_expired(path, data_version, date):
+            return None
+
+        return gzip.decompress(path.read_bytes()).decode()
+
+    def put(
+        self,
+        satellite: str,
+        data_version: str,
+        box: dict[str, float],
+        date: datetime.date,
+        data: str,
+    ):
+        path = self._path(self.key(satellite, data_version, box, date))
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write and rename, so concurrent readers never see a partial file
+        partial = path.with_name(f"{path.name}.{uuid.uuid4().hex}.partial")
+        partial.write_bytes(gzip.compress(data.encode()))
+        os.replace(partial, path)
@@ -1,19 +1,29 @@
 import datetime
 import json
 import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import StrEnum
 from pathlib import Path
 from typing import Iterable, Literal, TypeVar
 
 import httpx
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 from pydantic import BaseModel, field_validator
 
 from ..utils import retry
+from .cache import ResponseCache
 
 T = TypeVar("T", bound=BaseModel)
 
+# the area API returns up to 10 days per request
+MAX_DAY_RANGE = 10
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARNING)
 
@@ -83,41 +93,151 @@ class NASARecord(BaseModel):
         )
 
 
+def parse_interval(interval: str) -> float:
+    """Seconds in an interval like "10 minutes", as used by the FIRMS API."""
+    amount, unit = interval.split()
+    units = {"second": 1, "minute": 60, "hour": 60 * 60, "day": 24 * 60 * 60}
+    return float(amount) * units[unit.lower().rstrip("s")]
+
+
 class RateLimits:
+    """
+    Client side model of the rolling transaction window of the FIRMS API.
+
+    Transactions are tracked locally, so `mapkey_status` is only checked every
+    `resync_interval` seconds, when the budget runs out, or after the API told
+    us we exceeded it. Transactions reported by `mapkey_status` are assumed to
+    expire a full window after the check, which errs on the side of waiting.
+    Safe to share between threads.
+    """
+
     def __init__(
         self,
         client: httpx.Client,
         api_key: str,
         timeout: str = "10 minutes",
+        margin: int = 30,
+        resync_interval: float = 5 * 60,
     ):
         self.client = client
         self.api_key = api_key
         self.timeout = timeout
+        self.margin = margin
+        self.resync_interval = resync_interval
 
         self.limit = 0
-        self.used = 5000
+
+        self._transactions: deque[float] = deque()
+        self._synced_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def used(self) -> int:
+        return len(self._transactions)
 
     @property
     def remaining(self) -> int:
         return self.limit - self.used
 
-    def update(self):
+    def sync(self):
         response = self.client.get(
             "https://firms.modaps.eosdis.nasa.gov/mapserver/mapkey_status/?MAP_KEY="
             + self.api_key
         )
         response_data = response.json()
 
+        now = time.monotonic()
         self.limit = response_data["transaction_limit"]
-        self.used = response_data["current_transactions"]
         self.timeout = response_data["transaction_interval"]
+        self._transactions = deque([now] * response_data["current_transactions"])
+        self._synced_at = now
 
         logger.debug(f"Rate limits: {self}")
 
+    def _expire(self):
+        expired_before = time.monotonic() - parse_interval(self.timeout)
+        while self._transactions and self._transactions[0] <= expired_before:
+            self._transactions.popleft()
+
+    def acquire(self):
+        """Wait for an available transaction in the window, and take it."""
+        with self._lock:
+            if (
+                self._synced_at is None
+                or time.monotonic() - self._synced_at > self.resync_interval
+            ):
+                self.sync()
+
+            self._expire()
+            while self.remaining <= self.margin:
+                # check with the API after waiting, transactions reported when
+                # syncing may expire earlier than we assume
+                delay = 10.0
+                if self._transactions:
+                    delay = self._transactions[0] + parse_interval(self.timeout)
+                    delay = min(max(delay - time.monotonic(), 0.0), 10.0)
+
+                logger.debug(f"Rate limit exceeded, waiting for {delay:.0f}s. {self}")
+                time.sleep(delay)
+                self.sync()
+                self._expire()
+
+            self._transactions.append(time.monotonic())
+
+    def on_limit_exceeded(self):
+        """The API refused a request, our model drifted, so sync on next use."""
+        with self._lock:
+            self._synced_at = None
+
     def __str__(self):
         return f"{self.used}/{self.limit} ({self.timeout})"
 
 
+def get_day_ranges(
+    dates: Iterable[datetime.date],
+    max_day_range: int = 10,
+) -> list[tuple[datetime.date, int]]:
+    """Combine dates into (start date, number of days) ranges of consecutive dates."""
+    day_ranges: list[tuple[datetime.date, int]] = []
+    for date in sorted(set(dates)):
+        if day_ranges:
+            start_date, day_range = day_ranges[-1]
+            if (
+                date == start_date + datetime.timedelta(days=day_range)
+                and day_range < max_day_range
+            ):
+                day_ranges[-1] = (start_date, day_range + 1)
+                continue
+
+        day_ranges.append((date, 1))
+
+    return day_ranges
+
+
+def split_by_date(
+    data: str, start_date: datetime.date, day_range: int
+) -> dict[datetime.date, str]:
+    """
+    Split the response of a range request into a response per date, including
+    dates without detections.
+    """
+    header, *lines = data.splitlines()
+    acq_date_index = header.split(",").index("acq_date")
+
+    lines_by_date: dict[str, list[str]] = {
+        str(start_date + datetime.timedelta(days=i)): [] for i in range(day_range)
+    }
+    for line in lines:
+        acq_date = line.split(",")[acq_date_index]
+        if acq_date in lines_by_date:
+            lines_by_date[acq_date].append(line)
+
+    return {
+        datetime.date.fromisoformat(date): "\n".join([header, *date_lines])
+        for date, date_lines in lines_by_date.items()
+    }
+
+
 class NASAFetcher:
     satellites = ("SNPP", "NOAA20", "NOAA21")
     base_url = "https://firms.modaps.eosdis.nasa.gov/api/area/csv"
@@ -127,10 +247,12 @@ class NASAFetcher:
         api_key: str,
         instrument: Literal["VIIRS"] = "VIIRS",
         data_version: Literal["URT", "RT", "NRT", "SP"] = "NRT",
+        cache: ResponseCache | None = None,
     ):
         self.api_key = api_key
         self.instrument = instrument
         self.data_version = data_version
+        self.cache = cache
 
         self.client = httpx.Client(timeout=60)
         self.rate_limits = RateLimits(api_key=api_key, client=self.client)
@@ -141,28 +263,26 @@ class NASAFetcher:
         box: dict[str, float],
         date: datetime.date,
         satellite: str,
+        day_range: int = 1,
     ) -> str:
-        # wait for enough available transactions in our rate limit
-        # NASA uses some sort of rolling window for rate limits
-        self.rate_limits.update()
-        while self.rate_limits.remaining < 30:
-            logger.debug(
-                f"Rate limit exceeded, waiting for 10 seconds. {self.rate_limits}"
-            )
-            time.sleep(10)
-            self.rate_limits.update()
+        """Fetch `day_range` days starting at `date` in a single request."""
+        assert 1 <= day_range <= MAX_DAY_RANGE, f"Invalid day range: {day_range}"
+
+        self.rate_limits.acquire()
 
-        logger.debug(f"Fetching data for {box} on {date}")
+        logger.debug(f"Fetching data for {box} on {date} (+{day_range - 1} days)")
 
         area = "{min_x},{min_y},{max_x},{max_y}".format(**box)
 
         url = (
             self.base_url
-            + f"/{self.api_key}/{self.instrument}_{satellite}_{self.data_version}/{area}/1/{date}"
+            + f"/{self.api_key}/{self.instrument}_{satellite}_{self.data_version}/{area}/{day_range}/{date}"
         )
         response = self.client.get(url)
 
         if not response.text.startswith("latitude,longitude"):
+            if "transaction" in response.text.lower():
+                self.rate_limits.on_limit_exceeded()
             raise ValueError("Invalid response: " + response.text)
 
         return response.text
@@ -179,6 +299,56 @@ class NASAFetcher:
 
         return parsed_data
 
+    def parse_df(self, data: str) -> pd.DataFrame:
+        """
+        Parse a response into a DataFrame with the fields of `NASARecord`, with
+        the Arrow CSV reader, validating whole columns instead of creating a
+        record per row.
+        """
+        table = pa_csv.read_csv(
+            # a header without rows needs its line end to be read
+            pa.BufferReader(f"{data.rstrip()}\n".encode()),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={
+                    "satellite": pa.string(),
+                    "instrument": pa.string(),
+                    "version": pa.string(),
+                    "daynight": pa.string(),
+                    "confidence": pa.string(),
+                    "acq_time": pa.string(),
+                    "acq_date": pa.date32(),
+                },
+                strings_can_be_null=False,
+            ),
+        )
+
+        for column, enum in (
+            ("satellite", Satellite),
+            ("instrument", Instrument),
+            ("daynight", DayNight),
+            ("confidence", Confidence),
+        ):
+            values = table[column]
+            invalid = pc.invert(
+                pc.is_in(values, value_set=pa.array([member.value for member in enum]))
+            )
+            if pc.any(invalid).as_py():
+                raise ValueError(
+                    f"Invalid {column}: {sorted(set(values.filter(invalid).to_pylist()))}"
+                )
+
+        # times are HHMM, without leading zeros
+        acq_time = pc.strptime(
+            pc.utf8_lpad(table["acq_time"], width=4, padding="0"),
+            format="%H%M",
+            unit="s",
+        ).cast(pa.time32("s"))
+        table = table.set_column(
+            table.schema.get_field_index("acq_time"), "acq_time", acq_time
+        )
+
+        return table.select(list(NASARecord.model_fields)).to_pandas()
+
     def fetch(
         self,
         box: dict[str, float],
@@ -189,12 +359,122 @@ class NASAFetcher:
         # and the data they output is in the same format. This way we can partion
         # by just country and date.
         parsed_data = []
-        for satellite in satellites or self.satellites:
-            data = self._fetch_raw(box, date, satellite)
+        for data in self._fetch_ranges(box, [date], satellites, 1, 1):
             parsed_data += self.parse(data)
 
         return parsed_data
 
+    def fetch_many(
+        self,
+        box: dict[str, float],
+        dates: Iterable[datetime.date],
+        satellites: Iterable[str] | None = None,
+        max_workers: int = 6,
+        max_day_range: int = MAX_DAY_RANGE,
+    ) -> list[NASARecord]:
+        """
+        Fetch several dates for all satellites, with concurrent requests that
+        share the rate limit. Consecutive dates are combined into requests of up
+        to `max_day_range` days. Records are ordered by date and satellite, like
+        calling `fetch` for each date.
+        """
+        dates = sorted(set(dates))
+        responses = self._fetch_ranges(
+            box, dates, satellites, max_workers, max_day_range
+        )
+
+        # split the records of range requests back into dates
+        records_by_date: dict[datetime.date, list[NASARecord]] = {
+            date: [] for date in dates
+        }
+        for data in responses:
+            for record in self.parse(data):
+                if record.acq_date in records_by_date:
+                    records_by_date[record.acq_date].append(record)
+
+        return [record for date in dates for record in records_by_date[date]]
+
+    def fetch_many_df(
+        self,
+        box: dict[str, float],
+        dates: Iterable[datetime.date],
+        satellites: Iterable[str] | None = None,
+        max_workers: int = 6,
+        max_day_range: int = MAX_DAY_RANGE,
+    ) -> pd.DataFrame:
+        """`fetch_many`, parsed into a single DataFrame with `parse_df`."""
+        dates = sorted(set(dates))
+        responses = self._fetch_ranges(
+            box, dates, satellites, max_workers, max_day_range
+        )
+
+        if not responses:
+            return pd.DataFrame(columns=list(NASARecord.model_fields))
+
+        # responses are split by date and share a header, so parse them at once
+        header, *_ = responses[0].split("\n", 1)
+        rows = [line for data in responses for line in data.splitlines()[1:]]
+        return self.parse_df("\n".join([header, *rows]))
+
+    def _fetch_ranges(
+        self,
+        box: dict[str, float],
+        dates: list[datetime.date],
+        satellites: Iterable[str] | None,
+        max_workers: int,
+        max_day_range: int,
+    ) -> list[str]:
+        """
+        Responses for each date and satellite, in that order. Dates that are not
+        cached are fetched in range requests, which are split back into dates.
+        """
+        satellites = tuple(satellites or self.satellites)
+
+        responses: dict[tuple[datetime.date, str], str] = {}
+        requests = []
+        for satellite in satellites:
+            missing = []
+            for date in dates:
+                data = (
+                    self.cache.get(satellite, self.data_version, box, date)
+                    if self.cache is not None
+                    else None
+                )
+                if data is None:
+                    missing.append(date)
+                else:
+                    responses[date, satellite] = data
+
+            requests += [
+                (start_date, satellite, day_range)
+                for start_date, day_range in get_day_ranges(missing, max_day_range)
+            ]
+
+        if requests and self.cache is not None and self.cache.offline:
+            raise LookupError(
+                f"No cached FIRMS responses for {len(requests)} requests, "
+                f"starting with {requests[0][1]} on {requests[0][0]}"
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fetched = executor.map(
+                lambda request: self._fetch_raw(box, *request), requests
+            )
+
+            for (start_date, satellite, day_range), data in zip(requests, fetched):
+                for date, date_data in split_by_date(
+                    data, start_date, day_range
+                ).items():
+                    if self.cache is not None:
+                        self.cache.put(
+                            satellite, self.data_version, box, date, date_data
+                        )
+                    responses[date, satellite] = date_data
+
+        return [
+            responses[date, satellite] for date in dates for satellite in satellites
+        ]
+
     @staticmethod
     def serialize(data: list[T]) -> list[dict]:
         return [record.model_dump() for record in data]
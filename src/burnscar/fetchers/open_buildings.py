@@ -0,0 +1,68 @@
+import json
+import logging
+from pathlib import Path
+
+import httpx
+from shapely import box as shapely_box
+from shapely.geometry import shape
+
+logger = logging.getLogger(__name__)
+
+TILES_URL = "https://sites.research.google/open-buildings/tiles.geojson"
+TILE_URL = "https://storage.googleapis.com/open-buildings-data/v3/polygons_s2_level_4_gzip/{tile_id}_buildings.csv.gz"
+
+
+def fetch_tiles() -> bytes:
+    response = httpx.get(TILES_URL, follow_redirects=True)
+    response.raise_for_status()
+    return response.content
+
+
+def fetch_tile(tile_id: str, full_path: Path):
+    # tiles can be several GB, so stream them to disk
+    partial_path = full_path.with_suffix(".partial")
+    with httpx.stream(
+        "GET", TILE_URL.format(tile_id=tile_id), timeout=60, follow_redirects=True
+    ) as response:
+        response.raise_for_status()
+        with partial_path.open("wb") as f:
+            for chunk in response.iter_bytes():
+                f.write(chunk)
+
+    partial_path.rename(full_path)
+
+
+def ensure_open_buildings(path: Path, box: dict[str, float]) -> list[Path]:
+    """
+    Ensure the Open Buildings v3 tiles (gzipped csv) intersecting the box exist.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+
+    tiles_path = path / "tiles.geojson"
+    if not tiles_path.exists():
+        tiles_path.write_bytes(fetch_tiles())
+
+    area = shapely_box(box["min_x"], box["min_y"], box["max_x"], box["max_y"])
+    tiles = json.loads(tiles_path.read_text())
+
+    full_paths = []
+    for tile in tiles["features"]:
+        if not shape(tile["geometry"]).intersects(area):
+            continue
+
+        tile_id = tile["properties"]["tile_id"]
+        full_path = path / f"{tile_id}_buildings.csv.gz"
+        if not full_path.exists():
+            fetch_tile(tile_id, full_path)
+            logger.info(f"Downloaded Open Buildings tile {tile_id} to {full_path}")
+
+        full_paths.append(full_path)
+
+    return full_paths
+
+
+if __name__ == "__main__":
+    ensure_open_buildings(
+        Path("data/open_buildings"),
+        dict(min_x=4.7, min_y=52.3, max_x=5.0, max_y=52.4),
+    )
@@ -0,0 +1,59 @@
+import datetime
+import logging
+
+from ee.geometry import Geometry
+from ee.imagecollection import ImageCollection
+from ee.reducer import Reducer
+from shapely import Polygon
+
+from ..utils import date_from_millis, expect_type
+
+logger = logging.getLogger(__name__)
+
+S2_COLLECTION = "COPERNICUS/S2_SR_HARMONIZED"
+
+
+def fetch_s2_catalog(
+    box: dict[str, float],
+    date: datetime.date,
+) -> list[dict]:
+    """
+    Fetch the Sentinel-2 scene catalog for a single day within the box.
+
+    Earth Engine must be initialized, see `burnscar.validators.gee.initialize`.
+    """
+    ee_box = Geometry.Rectangle(
+        [box["min_x"], box["min_y"], box["max_x"], box["max_y"]]
+    )
+    scenes = (
+        ImageCollection(S2_COLLECTION)
+        .filterDate(str(date), str(date + datetime.timedelta(days=1)))
+        .filterBounds(ee_box)
+    )
+
+    catalog = (
+        scenes.reduceColumns(
+            reducer=Reducer.toList(4),
+            selectors=[
+                "system:index",
+                "system:time_start",
+                "CLOUDY_PIXEL_PERCENTAGE",
+                "system:footprint",
+            ],
+        )
+        .get("list")
+        .getInfo()
+    )
+    catalog = expect_type(catalog, list, [])
+    logger.info(f"Fetched {len(catalog)} Sentinel-2 scenes for {date}")
+
+    return [
+        dict(
+            scene_id=scene_id,
+            scene_date=date_from_millis(ts),
+            cloudy_pixel_percentage=cloudy_pixel_percentage,
+            # footprints are returned as GeoJSON LinearRings
+            footprint=Polygon(footprint["coordinates"]).wkt,
+        )
+        for scene_id, ts, cloudy_pixel_percentage, footprint in catalog
+    ]
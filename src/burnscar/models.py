@@ -12,6 +12,11 @@ class FireDetection(BaseModel):
     acq_date: datetime.date
     geom: Point
     area_include_geom: Polygon
+    area_include_id: str | None = None
+
+    # (date, cloudy pixel percentage) of the Sentinel-2 scenes around acq_date,
+    # when looked up in the scene catalog
+    image_metadata: list[tuple[datetime.date, float]] | None = None
 
     @field_validator("geom", "area_include_geom", mode="before")
     def geom_validator(cls, v) -> Geometry:
@@ -19,3 +24,16 @@ class FireDetection(BaseModel):
             v = bytes(v)
 
         return from_wkb(v)
+
+    @field_validator("image_metadata", mode="before")
+    def image_metadata_validator(cls, v) -> list[tuple] | None:
+        # missing values come in as NA/NaN from pandas
+        if v is None or not hasattr(v, "__iter__"):
+            return None
+
+        return [
+            (m["scene_date"], m["cloudy_pixel_percentage"])
+            if isinstance(m, dict)
+            else m
+            for m in v
+        ]
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import shapely
+from shapely import Geometry
+
+
+def plan_tiles(
+    geometry: Geometry,
+    tile_size: float = 1.0,
+    merge: bool = True,
+) -> list[dict[str, float]]:
+    """
+    Split the extent of a geometry into tiles of `tile_size` degrees, and keep
+    the tiles that intersect it. With `merge`, neighbouring tiles in a row are
+    combined into a single box, so an area costs fewer requests. Boxes have the
+    `min_x`, `min_y`, `max_x` and `max_y` keys of `st_extent`.
+    """
+    assert tile_size > 0, "Tile size must be positive"
+
+    min_x, min_y, max_x, max_y = shapely.bounds(geometry).tolist()
+    columns = max(math.ceil((max_x - min_x) / tile_size), 1)
+    rows = max(math.ceil((max_y - min_y) / tile_size), 1)
+
+    xs = np.minimum(min_x + np.arange(columns + 1) * tile_size, max_x)
+    ys = np.minimum(min_y + np.arange(rows + 1) * tile_size, max_y)
+
+    shapely.prepare(geometry)
+    tiles = shapely.box(
+        xs[:-1][np.newaxis, :], ys[:-1][:, np.newaxis], xs[1:], ys[1:, np.newaxis]
+    )
+    # tiles that only share an edge with the geometry have nothing to fetch
+    keep = shapely.intersects(geometry, tiles) & ~shapely.touches(geometry, tiles)
+
+    boxes = []
+    for row in range(rows):
+        column = 0
+        while column < columns:
+            if not keep[row, column]:
+                column += 1
+                continue
+
+            start = column
+            column += 1
+            while merge and column < columns and keep[row, column]:
+                column += 1
+
+            boxes.append(
+                {
+                    "min_x": float(xs[start]),
+                    "min_y": float(ys[row]),
+                    "max_x": float(xs[column]),
+                    "max_y": float(ys[row + 1]),
+                }
+            )
+
+    return boxes
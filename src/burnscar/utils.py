@@ -1,7 +1,9 @@
 import datetime
+import itertools
 import logging
 import time
-from typing import Any, Callable, Type, TypeVar
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Generator, Iterable, Type, TypeVar
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +39,14 @@ def timeit(label: str):
     return decorator
 
 
+def date_from_millis(ts: float) -> datetime.date:
+    """
+    UTC date of an Earth Engine timestamp in milliseconds, the days Earth Engine
+    filters and floors timestamps to, whatever the local time zone.
+    """
+    return datetime.datetime.fromtimestamp(ts / 1000.0, tz=datetime.UTC).date()
+
+
 def date_range(
     start_date: datetime.date, end_date: datetime.date
 ) -> list[datetime.date]:
@@ -46,6 +56,46 @@ def date_range(
     ]
 
 
+def chunked(iterable: Iterable[T], size: int) -> Generator[list[T], None, None]:
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def map_bounded(
+    func: Callable[[Any], T],
+    iterable: Iterable,
+    max_workers: int,
+    window: int | None = None,
+) -> Generator[T, None, None]:
+    """
+    Apply `func` to the items of `iterable` on a thread pool, yielding results
+    as they complete. The iterable is consumed lazily and at most `window` items
+    are in flight, so memory doesn't grow with the number of items.
+    """
+    window = window or 2 * max_workers
+    items = iter(iterable)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {
+            executor.submit(func, item) for item in itertools.islice(items, window)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            pending |= {
+                executor.submit(func, item)
+                for item in itertools.islice(items, len(done))
+            }
+            for future in done:
+                yield future.result()
+
+
 def expect_type(obj: Any, expected_type: Type[T], default: T) -> T:
     if not isinstance(obj, expected_type):
         logger.warning(
@@ -0,0 +1,26 @@
+import typing as t
+
+from ..models import FireDetection
+from .gee import ValidationResult
+
+
+class Validator(t.Protocol):
+    """Interface shared by the validation backends."""
+
+    def validate(
+        self,
+        detection: FireDetection,
+        buffer_distance: int = 1000,
+        days_around: int = 30,
+        max_cloudy_percentage: int = 20,
+        burnt_pixel_count_threshold: int = 10,
+        max_nbr_after: float = -0.10,
+        min_nbr_difference: float = 0.15,
+    ) -> ValidationResult: ...
+
+    def validate_many(
+        self,
+        detections: t.Iterable[FireDetection],
+        validation_params: dict,
+        max_workers: int = 10,
+    ) -> t.Generator[ValidationResult, None, None]: ...
@@ -0,0 +1,153 @@
+import functools
+import time
+import typing as t
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from ..models import FireDetection
+from .gee import GEEValidator
+from .replay import Replay
+
+
+class BenchmarkResult(BaseModel):
+    name: str
+    concurrency: int
+    detections: int
+    seconds: float
+    round_trips: int
+    latencies: list[float]  # per detection, in seconds
+
+    @property
+    def round_trips_per_detection(self) -> float:
+        return self.round_trips / max(self.detections, 1)
+
+    @property
+    def throughput(self) -> float:
+        """Detections per second."""
+        return self.detections / self.seconds if self.seconds else 0.0
+
+    @property
+    def p50(self) -> float:
+        return float(np.percentile(self.latencies, 50)) if self.latencies else 0.0
+
+    @property
+    def p95(self) -> float:
+        return float(np.percentile(self.latencies, 95)) if self.latencies else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<16}{self.concurrency:>12}"
+            f"{self.round_trips_per_detection:>16.2f}{self.throughput:>12.2f}"
+            f"{self.p50:>10.2f}{self.p95:>10.2f}"
+        )
+
+
+HEADER = (
+    f"{'':<16}{'concurrency':>12}{'trips/detection':>16}"
+    f"{'per second':>12}{'p50 (s)':>10}{'p95 (s)':>10}"
+)
+
+
+def read_detections(path: Path) -> list[FireDetection]:
+    """
+    Read detections from a csv export of `intermediate.firms_to_validate`, with
+    geometries as hex WKB.
+    """
+    rows = pd.read_csv(
+        path,
+        dtype={"geom": str, "area_include_geom": str, "area_include_id": str},
+    )
+    rows = rows.astype(object).where(rows.notna(), None)
+
+    return [FireDetection.model_validate(d) for d in rows.to_dict(orient="records")]
+
+
+def record(
+    key_path: Path,
+    fixtures: Path,
+    detections: list[FireDetection],
+    validation_params: dict,
+) -> int:
+    """Record the Earth Engine responses for validating the detections."""
+    with Replay(fixtures, mode="record") as replay:
+        validator = GEEValidator(key_path=key_path)
+        for detection in detections:
+            validator.validate(detection, **validation_params)
+
+    return replay.round_trips
+
+
+def run_benchmark(
+    fixtures: Path,
+    detections: list[FireDetection],
+    validation_params: dict,
+    concurrency_levels: t.Iterable[int] = (1, 10, 50),
+    latency: float | None = None,
+    jitter: float = 0.0,
+) -> list[BenchmarkResult]:
+    """
+    Benchmark `validate` and `validate_many` on recorded responses, served with
+    the given latency, or the latency measured while recording.
+    """
+    results = []
+    with Replay(fixtures, latency=latency, jitter=jitter) as replay:
+        validator = GEEValidator(key_path=Path("replay"))
+
+        # time each validation, including those from `validate_many`
+        latencies: list[float] = []
+        validate = validator.validate
+
+        @functools.wraps(validate)
+        def timed_validate(*args, **kwargs):
+            t0 = time.monotonic()
+            try:
+                return validate(*args, **kwargs)
+            finally:
+                latencies.append(time.monotonic() - t0)
+
+        validator.validate = timed_validate  # type: ignore[method-assign]
+
+        def measure(name: str, concurrency: int, run: t.Callable[[], t.Any]):
+            replay.latencies.clear()
+            latencies.clear()
+
+            t0 = time.monotonic()
+            run()
+            results.append(
+                BenchmarkResult(
+                    name=name,
+                    concurrency=concurrency,
+                    detections=len(detections),
+                    seconds=time.monotonic() - t0,
+                    round_trips=replay.round_trips,
+                    latencies=list(latencies),
+                )
+            )
+
+        measure(
+            "validate",
+            1,
+            lambda: [
+                validator.validate(detection, **validation_params)
+                for detection in detections
+            ],
+        )
+
+        def validate_many(max_workers: int) -> list:
+            return list(
+                validator.validate_many(
+                    detections, validation_params, max_workers=max_workers
+                )
+            )
+
+        for concurrency in concurrency_levels:
+            measure(
+                "validate_many",
+                concurrency,
+                functools.partial(validate_many, concurrency),
+            )
+
+    return results
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+from ee.computedobject import ComputedObject
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class RequestCache:
+    """
+    Memoizing cache for Earth Engine requests, keyed by the serialized expression.
+
+    Entries are evicted when they are least recently used and the cache is full,
+    or when they are older than `ttl` seconds. When `path` is set, responses are
+    also written to disk so they survive between runs. Concurrent requests for
+    the same expression wait for the one that is already in flight.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4096,
+        ttl: float | None = 24 * 60 * 60,
+        path: Path | str | None = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+
+        if self.path:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+        self._entries: OrderedDict[str, tuple[float, t.Any]] = OrderedDict()
+        self._in_flight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(obj: ComputedObject) -> str:
+        return hashlib.sha256(obj.serialize().encode()).hexdigest()
+
+    def get_info(self, obj: ComputedObject) -> t.Any:
+        return self.get_or_compute(self.key(obj), obj.getInfo)
+
+    def get_or_compute(self, key: str, compute: t.Callable[[], t.Any]) -> t.Any:
+        with self._lock:
+            value = self._get_memory(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if future is None:
+                future = Future()
+                self._in_flight[key] = future
+
+        # another thread is already fetching this expression, wait for it
+        if not is_owner:
+            with self._lock:
+                self.hits += 1
+            return future.result()
+
+        try:
+            value = self._get_disk(key)
+            if value is _MISSING:
+                with self._lock:
+                    self.misses += 1
+                value = compute()
+                self._set_disk(key, value)
+
+            with self._lock:
+                self._set_memory(key, value)
+                del self._in_flight[key]
+
+            future.set_result(value)
+            return value
+
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _get_memory(self, key: str) -> t.Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+
+        created, value = entry
+        if self._expired(created):
+            del self._entries[key]
+            return _MISSING
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_memory(self, key: str, value: t.Any):
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.path
+        return self.path / key[:2] / f"{key}.json"
+
+    def _get_disk(self, key: str) -> t.Any:
+        if not self.path:
+            return _MISSING
+
+        path = self._disk_path(key)
+        if not path.exists():
+            return _MISSING
+
+        if self._expired(path.stat().st_mtime):
+            path.unlink(missing_ok=True)
+            return _MISSING
+
+        try:
+            return json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return _MISSING
+
+    def _set_disk(self, key: str, value: t.Any):
+        if not self.path:
+            return
+
+        path = self._disk_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file first, so readers never see partial entries
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(value))
+        tmp_path.replace(path)
@@ -0,0 +1,299 @@
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+import typing as t
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from functools import partial
+
+from ..models import FireDetection
+from .base import Validator
+from .gee import ValidationResult, ValidationSummary
+from .retry import ErrorClass, RetryPolicy, classify_error
+
+logger = logging.getLogger(__name__)
+
+
+def get_rss_mb() -> float | None:
+    """Resident memory of this process in MB, where the platform exposes it."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+class AIMDLimiter:
+    """
+    Limit on the number of requests in flight, using additive increase and
+    multiplicative decrease (AIMD).
+
+    Every successful request raises the limit by `increase / limit`, so about
+    one per round of requests. The limit is multiplied by `decrease` when we hit
+    a quota error, or when the average latency grows beyond `latency_tolerance`
+    times the lowest average seen, at most once per round.
+    """
+
+    def __init__(
+        self,
+        initial: int = 10,
+        minimum: int = 1,
+        maximum: int = 50,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        latency_smoothing: float = 0.1,
+    ):
+        assert 1 <= minimum <= initial <= maximum, "Invalid concurrency bounds"
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.latency_smoothing = latency_smoothing
+
+        self._limit = float(initial)
+        self._completed = 0
+        self._last_decrease = 0
+
+        self.latency: float | None = None
+        self.min_latency: float | None = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_success(self, latency: float | None = None):
+        self._completed += 1
+
+        if latency is not None:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.latency_smoothing * (latency - self.latency)
+
+            # only trust the average once it has seen a round of requests
+            if self._completed >= self.limit:
+                self.min_latency = min(self.min_latency or self.latency, self.latency)
+
+        if (
+            self.latency is not None
+            and self.min_latency is not None
+            and self.latency > self.latency_tolerance * self.min_latency
+        ):
+            self.decrease_limit()
+        else:
+            self._limit = min(self.maximum, self._limit + self.increase / self._limit)
+
+    def on_overload(self):
+        self._completed += 1
+        self.decrease_limit()
+
+    def decrease_limit(self):
+        # decrease once per round, requests in flight saw the same overload
+        if self._last_decrease and self._completed - self._last_decrease < self.limit:
+            return
+
+        self._last_decrease = self._completed
+        self._limit = max(self.minimum, self._limit * self.decrease)
+        logger.info(f"Decreased Earth Engine concurrency to {self.limit}")
+
+
+class AsyncValidator:
+    """
+    Validate detections with an in-flight limit that adapts to Earth Engine.
+
+    Validations run on a thread pool of `limiter.maximum` threads, which caps
+    memory use. On top of that, no new work is admitted while the process uses
+    more than `memory_limit_mb`. Quota errors the validator retries itself
+    decrease the limit as they happen. Detections that still fail on quota errors
+    after those retries are retried up to `max_attempts` times.
+    """
+
+    def __init__(
+        self,
+        validator: Validator,
+        validation_params: dict,
+        limiter: AIMDLimiter | None = None,
+        memory_limit_mb: float | None = None,
+        max_attempts: int = 3,
+    ):
+        self.validator = validator
+        self.validation_params = validation_params
+        self.limiter = limiter or AIMDLimiter()
+        self.memory_limit_mb = memory_limit_mb
+        self.max_attempts = max_attempts
+
+    def _memory_exceeded(self) -> bool:
+        if self.memory_limit_mb is None:
+            return False
+
+        rss_mb = get_rss_mb()
+        return rss_mb is not None and rss_mb > self.memory_limit_mb
+
+    def _on_retry_error(self, loop: asyncio.AbstractEventLoop, error: ErrorClass):
+        # called from the worker threads, the limiter belongs to the event loop
+        if error == ErrorClass.quota:
+            loop.call_soon_threadsafe(self.limiter.on_overload)
+
+    async def _validate(
+        self,
+        executor: ThreadPoolExecutor,
+        detection: FireDetection,
+        attempt: int,
+    ) -> tuple[ValidationResult | None, Exception | None, float]:
+        loop = asyncio.get_running_loop()
+
+        # back off before retrying a detection
+        if attempt > 1:
+            await asyncio.sleep(2**attempt)
+
+        t0 = time.monotonic()
+        try:
+            result = await loop.run_in_executor(
+                executor,
+                partial(self.validator.validate, detection, **self.validation_params),
+            )
+            return result, None, time.monotonic() - t0
+        except Exception as e:
+            return None, e, time.monotonic() - t0
+
+    async def avalidate_many(
+        self,
+        detections: t.Iterable[FireDetection],
+    ) -> t.AsyncGenerator[ValidationResult, None]:
+        executor = ThreadPoolExecutor(max_workers=self.limiter.maximum)
+        retry_policy = getattr(self.validator, "retry_policy", None)
+        if isinstance(retry_policy, RetryPolicy):
+            retry_policy.on_error = partial(
+                self._on_retry_error, asyncio.get_running_loop()
+            )
+        pending: dict[asyncio.Task, tuple[FireDetection, int]] = {}
+        retries: deque[tuple[FireDetection, int]] = deque()
+        remaining = iter(detections)
+        exhausted = False
+
+        try:
+            while True:
+                # admit work up to the current limit
+                while retries or not exhausted:
+                    if len(pending) >= self.limiter.limit:
+                        break
+                    if pending and self._memory_exceeded():
+                        self.limiter.decrease_limit()
+                        break
+
+                    if retries:
+                        detection, attempt = retries.popleft()
+                    else:
+                        next_detection = next(remaining, None)
+                        if next_detection is None:
+                            exhausted = True
+                            break
+                        detection, attempt = next_detection, 1
+
+                    task = asyncio.create_task(
+                        self._validate(executor, detection, attempt)
+                    )
+                    pending[task] = (detection, attempt)
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    detection, attempt = pending.pop(task)
+                    result, error, latency = task.result()
+
+                    if result is not None:
+                        # detections that stop early don't say much about load
+                        analysed = result.before_date is not None
+                        self.limiter.on_success(latency if analysed else None)
+                        yield result
+                        continue
+
+                    assert error is not None
+                    if classify_error(error) == ErrorClass.quota:
+                        self.limiter.on_overload()
+                        if attempt < self.max_attempts:
+                            retries.append((detection, attempt + 1))
+                            continue
+
+                    logger.error(
+                        f"Validation failed for FIRMS ID {detection.firms_id}: {error}"
+                    )
+                    yield ValidationResult(
+                        firms_id=detection.firms_id,
+                        acq_date=detection.acq_date,
+                        no_data=True,
+                    )
+
+        finally:
+            for task in pending:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            if isinstance(retry_policy, RetryPolicy):
+                retry_policy.on_error = None
+
+    def validate_many(
+        self,
+        detections: t.Iterable[FireDetection],
+        lean: bool = False,
+        max_buffered: int | None = None,
+    ) -> t.Generator[ValidationResult | ValidationSummary, None, None]:
+        """
+        Synchronous interface, runs the event loop in a background thread.
+
+        At most `max_buffered` results, by default the maximum concurrency, wait
+        to be consumed, so validation doesn't run ahead of the consumer. With
+        `lean`, results are yielded as `ValidationSummary`. Closing the generator
+        stops the loop and cancels the validations in flight.
+        """
+        results: queue.Queue = queue.Queue(maxsize=max_buffered or self.limiter.maximum)
+        stop = threading.Event()
+        done = object()
+
+        def put(item: t.Any) -> bool:
+            # blocks the loop while the queue is full, until the consumer is gone
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        async def produce():
+            async with aclosing(self.avalidate_many(detections)) as validations:
+                async for result in validations:
+                    if not put(ValidationSummary(result) if lean else result):
+                        break
+
+        def run():
+            try:
+                asyncio.run(produce())
+            except Exception as e:
+                put(e)
+            finally:
+                put(done)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+
+        try:
+            while (result := results.get()) is not done:
+                if isinstance(result, Exception):
+                    raise result
+                yield result
+        finally:
+            stop.set()
+            thread.join()
@@ -1,11 +1,19 @@
 import datetime
+import inspect
 import json
 import logging
 import typing as t
+from contextlib import nullcontext
 from pathlib import Path
 
 from ee import Initialize
 from ee._helpers import ServiceAccountCredentials
+from ee.apifunction import ApiFunction
+from ee.computedobject import ComputedObject
+from ee.dictionary import Dictionary
+from ee.ee_date import Date
+from ee.ee_number import Number
+from ee.feature import Feature
 from ee.featurecollection import FeatureCollection
 from ee.filter import Filter
 from ee.geometry import Geometry
@@ -14,17 +22,42 @@ from ee.imagecollection import ImageCollection
 from ee.join import Join
 from ee.reducer import Reducer
 from pydantic import BaseModel
+from shapely import Polygon as ShapelyPolygon
+from shapely.geometry import shape
 
 from ..models import FireDetection
-from ..utils import expect_type
+from ..utils import chunked, date_from_millis, expect_type, map_bounded
+from .cache import RequestCache
+from .grouping import (
+    MAX_GROUP_EXTENT,
+    MAX_GROUP_SIZE,
+    METERS_PER_DEGREE,
+    get_aoi_bounds,
+    group_overlapping,
+)
+from .metrics import ValidationMetrics
+from .retry import RetryPolicy
+
+if t.TYPE_CHECKING:
+    from .store import ResultStore
 
 logger = logging.getLogger(__name__)
 
+MS_PER_DAY = 24 * 60 * 60 * 1000
+
 
 def read_key(key_path: Path) -> dict[str, str]:
     return json.loads(key_path.read_text())
 
 
+def initialize(key_path: Path) -> None:
+    key = read_key(key_path)
+    service_account = key["client_email"]
+    project_id = key["project_id"]
+    credentials = ServiceAccountCredentials(service_account, str(key_path))
+    Initialize(credentials=credentials, project=project_id)
+
+
 class ValidationImages(BaseModel):
     class Config:
         arbitrary_types_allowed = True
@@ -34,6 +67,46 @@ class ValidationImages(BaseModel):
     burnt_area: Image
 
 
+def parse_burnt_area(geojson: t.Any) -> str | None:
+    """Burnt area as WKT, from the GeoJSON geometry returned by Earth Engine."""
+    if not isinstance(geojson, dict):
+        return None
+
+    burnt_area = shape(geojson)
+    return None if burnt_area.is_empty else burnt_area.wkt
+
+
+def complete_validation_params(
+    validation_params: dict,
+    count_buildings: bool = True,
+) -> dict:
+    """
+    Validation params completed with the defaults of `GEEValidator.validate`,
+    as they identify stored results.
+    """
+    signature = inspect.signature(GEEValidator.validate)
+    bound = signature.bind_partial(None, None, **validation_params)
+    bound.apply_defaults()
+    validation_params = {
+        name: value
+        for name, value in bound.arguments.items()
+        if name not in ("self", "detection")
+    }
+
+    # results without building counts can't be reused when counting on gee
+    if not count_buildings:
+        validation_params["count_buildings"] = False
+
+    return validation_params
+
+
+class ImagerySelection(BaseModel):
+    before_date: datetime.date | None = None
+    after_date: datetime.date | None = None
+    no_data: bool = False
+    too_cloudy: bool = False
+
+
 class ValidationResult(BaseModel):
     class Config:
         arbitrary_types_allowed = True
@@ -46,6 +119,7 @@ class ValidationResult(BaseModel):
     burnt_pixel_count: int = 0
     burnt_building_count: int = 0
     burnt_buildings: FeatureCollection | None = None
+    burnt_area: str | None = None  # WKT, when buildings are counted locally
 
     # imagery
     images: ValidationImages | None = None
@@ -55,22 +129,180 @@ class ValidationResult(BaseModel):
     too_cloudy: bool = False
 
 
+class ValidationSummary:
+    """
+    Scalar fields of a `ValidationResult`, without the Earth Engine objects, for
+    streaming many results with little memory.
+    """
+
+    __slots__ = (
+        "acq_date",
+        "after_date",
+        "before_date",
+        "burn_scar_detected",
+        "burnt_area",
+        "burnt_building_count",
+        "burnt_pixel_count",
+        "firms_id",
+        "no_data",
+        "too_cloudy",
+    )
+
+    firms_id: int
+    acq_date: datetime.date
+    before_date: datetime.date | None
+    after_date: datetime.date | None
+    burn_scar_detected: bool
+    burnt_pixel_count: int
+    burnt_building_count: int
+    burnt_area: str | None
+    no_data: bool
+    too_cloudy: bool
+
+    def __init__(self, result: ValidationResult):
+        for field in self.__slots__:
+            setattr(self, field, getattr(result, field))
+
+    def model_dump(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
 class GEEValidator:
-    def __init__(self, key_path: Path):
-        key = read_key(key_path)
-        service_account = key["client_email"]
-        project_id = key["project_id"]
-        credentials = ServiceAccountCredentials(service_account, str(key_path))
-        Initialize(credentials=credentials, project=project_id)
+    def __init__(
+        self,
+        key_path: Path,
+        cache: RequestCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        store: "ResultStore | None" = None,
+        count_buildings: bool = True,
+        metrics: ValidationMetrics | None = None,
+    ):
+        initialize(key_path)
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.store = store
+        self.metrics = metrics
 
-    def validate_many(
+        # when False, results carry the burnt area instead of a building count,
+        # so buildings can be counted against a local copy of Open Buildings
+        self.count_buildings = count_buildings
+
+    def _get_info(self, obj: ComputedObject, stage: str) -> t.Any:
+        """
+        Fetch the value of an Earth Engine object, retrying quota and transient
+        errors, through the cache if set. The request is recorded in the
+        metrics under `stage`.
+        """
+        if self.metrics is None:
+            return self._compute(obj)
+
+        with self.metrics.stage(stage):
+            return self._compute(obj)
+
+    def _compute(self, obj: ComputedObject) -> t.Any:
+        def compute() -> t.Any:
+            if self.metrics is None:
+                return self.retry_policy.call(obj.getInfo)
+
+            self.metrics.on_request()
+            return self.retry_policy.call(obj.getInfo, on_error=self.metrics.on_error)
+
+        if self.cache is None:
+            return compute()
+
+        return self.cache.get_or_compute(self.cache.key(obj), compute)
+
+    def _measure(
+        self,
+        detections: list[FireDetection],
+        total: bool = True,
+    ) -> t.ContextManager:
+        if self.metrics is None:
+            return nullcontext()
+
+        return self.metrics.detections([d.firms_id for d in detections], total)
+
+    def get_validation_params(self, validation_params: dict) -> dict:
+        """Validation params completed with the defaults of `validate`."""
+        return complete_validation_params(validation_params, self.count_buildings)
+
+    def _get_stored(
+        self,
+        detections: list[FireDetection],
+        validation_params: dict,
+    ) -> tuple[list[ValidationResult], list[FireDetection]]:
+        """Split detections in stored results and detections still to validate."""
+        if self.store is None:
+            return [], detections
+
+        validation_params = self.get_validation_params(validation_params)
+        stored, pending = [], []
+        for detection in detections:
+            result = self.store.get(detection, validation_params)
+            if result is None:
+                pending.append(detection)
+            else:
+                stored.append(result)
+
+        return stored, pending
+
+    def _put_stored(
         self,
         detections: list[FireDetection],
         validation_params: dict,
+        results: list[ValidationResult],
+    ):
+        if self.store is None:
+            return
+
+        validation_params = self.get_validation_params(validation_params)
+        for detection, result in zip(detections, results):
+            self.store.put(detection, validation_params, result)
+
+    def validate_many(
+        self,
+        detections: t.Iterable[FireDetection],
+        validation_params: dict,
         max_workers: int = 10,
-    ) -> t.Generator[ValidationResult, None, None]:
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        batch_size: int | None = None,
+        group: bool = False,
+        lean: bool = False,
+        window: int | None = None,
+    ) -> t.Generator[ValidationResult | ValidationSummary, None, None]:
+        """
+        Validate detections concurrently, yielding results as they complete.
+
+        Detections are consumed lazily with at most `window` (default twice
+        `max_workers`) detections or batches in flight. With `lean`, results are
+        `ValidationSummary`s without Earth Engine objects, so memory stays flat
+        regardless of the number of detections. Grouping needs all detections
+        up front.
+        """
+        if group:
+            results = self._validate_many_grouped(
+                list(detections), validation_params, max_workers
+            )
+        elif batch_size:
+            results = self._validate_many_batched(
+                detections, validation_params, max_workers, batch_size, window
+            )
+        else:
+            results = self._validate_many_streamed(
+                detections, validation_params, max_workers, window
+            )
+
+        if lean:
+            yield from (ValidationSummary(result) for result in results)
+        else:
+            yield from results
 
+    def _validate_many_streamed(
+        self,
+        detections: t.Iterable[FireDetection],
+        validation_params: dict,
+        max_workers: int,
+        window: int | None,
+    ) -> t.Generator[ValidationResult, None, None]:
         def safe_validate(detection: FireDetection) -> ValidationResult:
             try:
                 return self.validate(detection, **validation_params)
@@ -84,10 +316,313 @@ class GEEValidator:
                     no_data=True,
                 )
 
+        yield from map_bounded(safe_validate, detections, max_workers, window)
+
+    def _validate_many_grouped(
+        self,
+        detections: list[FireDetection],
+        validation_params: dict,
+        max_workers: int,
+    ) -> t.Generator[ValidationResult, None, None]:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        selection_params = {
+            key: value
+            for key, value in validation_params.items()
+            if key in ("days_around", "max_cloudy_percentage")
+        }
+        buffer_distance = validation_params.get("buffer_distance", 1000)
+
+        def safe_select_imagery(detection: FireDetection) -> ImagerySelection:
+            try:
+                # the total is only timed around the validation of the group, so
+                # a detection isn't counted twice
+                with self._measure([detection], total=False):
+                    return self._get_imagery_selection(detection, **selection_params)
+            except Exception as e:
+                logger.error(
+                    f"Validation failed for FIRMS ID {detection.firms_id}: {e}"
+                )
+                return ImagerySelection(no_data=True)
+
+        stored, detections = self._get_stored(detections, validation_params)
+        yield from stored
+
+        def safe_validate_group(
+            group: list[FireDetection],
+            selection: ImagerySelection,
+        ) -> list[ValidationResult]:
+            try:
+                with self._measure(group):
+                    results = self.validate_group(group, selection, **validation_params)
+                self._put_stored(group, validation_params, results)
+                return results
+            except Exception as e:
+                firms_ids = [detection.firms_id for detection in group]
+                logger.error(f"Validation failed for FIRMS IDs {firms_ids}: {e}")
+                return [
+                    ValidationResult(
+                        firms_id=detection.firms_id,
+                        acq_date=detection.acq_date,
+                        no_data=True,
+                    )
+                    for detection in group
+                ]
+
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(safe_validate, det): det for det in detections}
+            # first find the imagery for each detection, stopping early when
+            # there is none or it is too cloudy
+            selections = executor.map(safe_select_imagery, detections)
+
+            # detections that share an include area and imagery dates are
+            # grouped when their Areas of Interest overlap
+            candidates: dict[tuple, list[FireDetection]] = {}
+            for detection, selection in zip(detections, selections):
+                if selection.no_data or selection.too_cloudy:
+                    yield ValidationResult(
+                        firms_id=detection.firms_id,
+                        acq_date=detection.acq_date,
+                        no_data=selection.no_data,
+                        too_cloudy=selection.too_cloudy,
+                    )
+                    continue
+
+                key = (
+                    detection.area_include_geom.wkb,
+                    selection.before_date,
+                    selection.after_date,
+                )
+                candidates.setdefault(key, []).append(detection)
+
+            futures = []
+            for (_, before, after), candidate_detections in candidates.items():
+                selection = ImagerySelection(before_date=before, after_date=after)
+                aois = [
+                    get_aoi_bounds(detection, buffer_distance)
+                    for detection in candidate_detections
+                ]
+                for indices in group_overlapping(
+                    aois,
+                    max_size=MAX_GROUP_SIZE,
+                    max_extent=MAX_GROUP_EXTENT / METERS_PER_DEGREE,
+                ):
+                    group = [candidate_detections[i] for i in indices]
+                    futures.append(
+                        executor.submit(safe_validate_group, group, selection)
+                    )
+
             for future in as_completed(futures):
-                yield future.result()
+                yield from future.result()
+
+    def validate_group(
+        self,
+        detections: list[FireDetection],
+        selection: ImagerySelection,
+        buffer_distance: int = 1000,
+        days_around: int = 30,
+        max_cloudy_percentage: int = 20,
+        burnt_pixel_count_threshold: int = 10,
+        max_nbr_after: float = -0.10,
+        min_nbr_difference: float = 0.15,
+    ) -> list[ValidationResult]:
+        """
+        Validate a group of nearby detections that share their imagery.
+
+        The NBR analysis runs once on the union of the detections' Areas of
+        Interest, after which burnt pixels and buildings are counted within each
+        detection's own Area of Interest, all in a single request. Buildings are
+        counted when they intersect a burnt area anywhere in the union, so a
+        building at the edge of an Area of Interest may be counted where
+        `validate` would not.
+        """
+        members = FeatureCollection(
+            [
+                Feature(
+                    self._get_ee_aoi_bounds(detection, buffer_distance),
+                    {"index": index},
+                )
+                for index, detection in enumerate(detections)
+            ]
+        )
+        ee_union_bounds = members.geometry().dissolve(maxError=1)
+
+        before, after = selection.before_date, selection.after_date
+        before_image, after_image = self._get_selected_images(
+            detections[0].area_include_geom,
+            ee_union_bounds,
+            selection,
+            max_cloudy_percentage,
+        )
+
+        nbr_difference = self._get_nbr_difference(before_image, after_image)
+        nbr_mask = self._get_nbr_mask(
+            after_image, nbr_difference, max_nbr_after, min_nbr_difference
+        )
+        nbr_masked = nbr_difference.updateMask(nbr_mask)
+
+        burnt_area_vector = self._get_burnt_area_vector(
+            ee_union_bounds, nbr_mask, nbr_masked
+        )
+        if self.count_buildings:
+            buildings = self._get_buildings(ee_union_bounds)
+            burnt_buildings = self._get_burnt_buildings(burnt_area_vector, buildings)
+
+        def attribute(member) -> Feature:
+            member = Feature(member)
+            ee_aoi_bounds = member.geometry()
+            properties = {
+                "index": member.get("index"),
+                "burnt_pixel_count": nbr_masked.reduceRegion(
+                    reducer=Reducer.count(),
+                    geometry=ee_aoi_bounds,
+                    scale=10,
+                ).get("NBR"),
+            }
+            if self.count_buildings:
+                properties["burnt_building_count"] = burnt_buildings.filterBounds(
+                    ee_aoi_bounds
+                ).size()
+            else:
+                properties["burnt_area"] = burnt_area_vector.geometry().intersection(
+                    ee_aoi_bounds, maxError=1
+                )
+
+            return Feature(None, properties)
+
+        response = self._get_info(members.map(attribute), stage="group")
+        response = expect_type(response, dict, {})
+        properties = {
+            feature["properties"]["index"]: feature["properties"]
+            for feature in response.get("features", [])
+        }
+
+        return [
+            self._parse_batch_result(
+                detection,
+                {
+                    "before_date": str(before),
+                    "after_date": str(after),
+                    **properties.get(index, {}),
+                },
+                burnt_pixel_count_threshold,
+            )
+            for index, detection in enumerate(detections)
+        ]
+
+    def _validate_many_batched(
+        self,
+        detections: t.Iterable[FireDetection],
+        validation_params: dict,
+        max_workers: int,
+        batch_size: int,
+        window: int | None,
+    ) -> t.Generator[ValidationResult, None, None]:
+        def safe_validate_batch(
+            batch: list[FireDetection],
+        ) -> list[ValidationResult]:
+            stored, batch = self._get_stored(batch, validation_params)
+            if not batch:
+                return stored
+
+            try:
+                with self._measure(batch):
+                    results = self.validate_batch(batch, **validation_params)
+                self._put_stored(batch, validation_params, results)
+                return stored + results
+            except Exception as e:
+                firms_ids = [detection.firms_id for detection in batch]
+                logger.error(f"Validation failed for FIRMS IDs {firms_ids}: {e}")
+                return stored + [
+                    ValidationResult(
+                        firms_id=detection.firms_id,
+                        acq_date=detection.acq_date,
+                        no_data=True,
+                    )
+                    for detection in batch
+                ]
+
+        for results in map_bounded(
+            safe_validate_batch,
+            chunked(detections, batch_size),
+            max_workers,
+            window,
+        ):
+            yield from results
+
+    def validate_batch(
+        self,
+        detections: list[FireDetection],
+        buffer_distance: int = 1000,
+        days_around: int = 30,
+        max_cloudy_percentage: int = 20,
+        burnt_pixel_count_threshold: int = 10,
+        max_nbr_after: float = -0.10,
+        min_nbr_difference: float = 0.15,
+    ) -> list[ValidationResult]:
+        """
+        Validate a chunk of detections in a single Earth Engine request.
+
+        The detections are packed into a FeatureCollection and the validation is
+        mapped over it on the server, so the whole chunk costs one round trip
+        instead of four per detection. Results don't include `images` and
+        `burnt_buildings`, as those would have to be fetched separately.
+        """
+        # detections with imagery metadata from the scene catalog that don't
+        # need pixel analysis are resolved without a request
+        results: dict[int, ValidationResult] = {}
+        for index, detection in enumerate(detections):
+            if detection.image_metadata is None:
+                continue
+
+            selection = self._select_imagery(
+                detection.image_metadata, detection.acq_date, max_cloudy_percentage
+            )
+            if selection.no_data or selection.too_cloudy:
+                results[index] = ValidationResult(
+                    firms_id=detection.firms_id,
+                    acq_date=detection.acq_date,
+                    no_data=selection.no_data,
+                    too_cloudy=selection.too_cloudy,
+                )
+
+        if len(results) == len(detections):
+            return [results[index] for index in range(len(detections))]
+
+        ee_detections = FeatureCollection(
+            [
+                self._get_ee_detection(index, detection)
+                for index, detection in enumerate(detections)
+                if index not in results
+            ]
+        )
+
+        def validate_feature(feature) -> Feature:
+            return self._validate_feature(
+                Feature(feature),
+                buffer_distance=buffer_distance,
+                days_around=days_around,
+                max_cloudy_percentage=max_cloudy_percentage,
+                max_nbr_after=max_nbr_after,
+                min_nbr_difference=min_nbr_difference,
+                count_buildings=self.count_buildings,
+            )
+
+        response = self._get_info(ee_detections.map(validate_feature), stage="batch")
+        response = expect_type(response, dict, {})
+        properties = {
+            feature["properties"]["index"]: feature["properties"]
+            for feature in response.get("features", [])
+        }
+
+        return [
+            results.get(index)
+            or self._parse_batch_result(
+                detection,
+                properties.get(index, {"no_data": True}),
+                burnt_pixel_count_threshold,
+            )
+            for index, detection in enumerate(detections)
+        ]
 
     def validate(
         self,
@@ -99,42 +634,73 @@ class GEEValidator:
         max_nbr_after: float = -0.10,
         min_nbr_difference: float = 0.15,
     ) -> ValidationResult:
-        result = ValidationResult(
-            firms_id=detection.firms_id, acq_date=detection.acq_date
+        validation_params = dict(
+            buffer_distance=buffer_distance,
+            days_around=days_around,
+            max_cloudy_percentage=max_cloudy_percentage,
+            burnt_pixel_count_threshold=burnt_pixel_count_threshold,
+            max_nbr_after=max_nbr_after,
+            min_nbr_difference=min_nbr_difference,
         )
 
-        ee_aoi_bounds = self._get_ee_aoi_bounds(detection, buffer_distance)
+        # skip detections we validated before with the same parameters
+        stored_params = self.get_validation_params(validation_params)
+        if self.store is not None:
+            stored_result = self.store.get(detection, stored_params)
+            if stored_result is not None:
+                return stored_result
 
-        s2 = self._get_s2_collection(detection, days_around)
+        with self._measure([detection]):
+            result = self._validate(
+                detection,
+                buffer_distance=buffer_distance,
+                days_around=days_around,
+                max_cloudy_percentage=max_cloudy_percentage,
+                burnt_pixel_count_threshold=burnt_pixel_count_threshold,
+                max_nbr_after=max_nbr_after,
+                min_nbr_difference=min_nbr_difference,
+            )
 
-        image_dates = self._get_image_dates(image_collection=s2)
+        if self.store is not None:
+            self.store.put(detection, stored_params, result)
 
-        # we stop early when there is no data from before and after the fire
-        if not self._imagery_available(image_dates, detection.acq_date):
-            result.no_data = True
-            return result
+        return result
 
-        # filter out cloudy images
-        s2 = s2.filter(Filter.lt("CLOUDY_PIXEL_PERCENTAGE", max_cloudy_percentage))
-        image_dates = self._get_image_dates(image_collection=s2)
+    def _validate(
+        self,
+        detection: FireDetection,
+        buffer_distance: int,
+        days_around: int,
+        max_cloudy_percentage: int,
+        burnt_pixel_count_threshold: int,
+        max_nbr_after: float,
+        min_nbr_difference: float,
+    ) -> ValidationResult:
+        result = ValidationResult(
+            firms_id=detection.firms_id, acq_date=detection.acq_date
+        )
 
-        # we also stop early when available imagery is too cloudy
-        if not self._imagery_available(image_dates, detection.acq_date):
-            result.too_cloudy = True
-            return result
+        ee_aoi_bounds = self._get_ee_aoi_bounds(detection, buffer_distance)
 
-        # get nearest before and after image
-        before, after = self._get_nearest_surrounding_dates(
-            detection.acq_date, image_dates
+        selection = self._get_imagery_selection(
+            detection, days_around, max_cloudy_percentage
         )
 
-        # Get images for before and after dates
-        before_image = self._get_image_for_date(ee_aoi_bounds, s2, before)
-        after_image = self._get_image_for_date(ee_aoi_bounds, s2, after)
+        # we stop early when there is no data from before and after the fire,
+        # and also when available imagery is too cloudy
+        if selection.no_data or selection.too_cloudy:
+            result.no_data = selection.no_data
+            result.too_cloudy = selection.too_cloudy
+            return result
 
-        # add Normalized Burn Ratio (NBR) to images
-        before_image = self._add_NBR(before_image)
-        after_image = self._add_NBR(after_image)
+        # nearest clear before and after image, with Normalized Burn Ratio (NBR)
+        before, after = selection.before_date, selection.after_date
+        before_image, after_image = self._get_selected_images(
+            detection.area_include_geom,
+            ee_aoi_bounds,
+            selection,
+            max_cloudy_percentage,
+        )
 
         # calculate difference in NBR and create a mask using some threshold
         nbr_difference = self._get_nbr_difference(before_image, after_image)
@@ -149,12 +715,21 @@ class GEEValidator:
             ee_aoi_bounds, nbr_mask, nbr_masked
         )
 
-        # filter buildings in Area of Interest
-        buildings = self._get_buildings(ee_aoi_bounds)
+        if self.count_buildings:
+            # filter buildings in Area of Interest
+            buildings = self._get_buildings(ee_aoi_bounds)
+
+            # spatially join buildings with burnt area vector
+            burnt_buildings = self._get_burnt_buildings(burnt_area_vector, buildings)
+            result.burnt_building_count = self._get_burnt_building_count(
+                burnt_buildings
+            )
+            result.burnt_buildings = burnt_buildings
 
-        # spatially join buildings with burnt area vector
-        burnt_buildings = self._get_burnt_buildings(burnt_area_vector, buildings)
-        burnt_building_count = self._get_burnt_building_count(burnt_buildings)
+        else:
+            result.burnt_area = parse_burnt_area(
+                self._get_info(burnt_area_vector.geometry(), stage="burnt_area")
+            )
 
         # count burnt pixels
         burnt_pixel_count = self._get_burnt_pixel_count(ee_aoi_bounds, nbr_masked)
@@ -163,8 +738,6 @@ class GEEValidator:
         result.before_date = before
         result.after_date = after
         result.burnt_pixel_count = burnt_pixel_count
-        result.burnt_building_count = burnt_building_count
-        result.burnt_buildings = burnt_buildings
 
         result.images = ValidationImages(
             before=before_image, after=after_image, burnt_area=nbr_masked
@@ -178,6 +751,171 @@ class GEEValidator:
 
         return result
 
+    @staticmethod
+    def _get_ee_detection(index: int, detection: FireDetection) -> Feature:
+        ee_area_include_bounds = Geometry.Polygon(
+            list(detection.area_include_geom.exterior.coords)
+        ).bounds()
+
+        return Feature(
+            Geometry.Point(detection.geom.x, detection.geom.y),
+            {
+                "index": index,
+                "acq_date": str(detection.acq_date),
+                "area_include_bounds": ee_area_include_bounds,
+            },
+        )
+
+    @classmethod
+    def _validate_feature(
+        cls,
+        feature: Feature,
+        buffer_distance: int,
+        days_around: int,
+        max_cloudy_percentage: int,
+        max_nbr_after: float,
+        min_nbr_difference: float,
+        count_buildings: bool = True,
+    ) -> Feature:
+        """Server-side counterpart of `validate` for a single detection feature."""
+        acq_date = Date(feature.get("acq_date"))
+        ee_aoi_bounds = feature.geometry().buffer(distance=buffer_distance).bounds()
+
+        s2: ImageCollection = (
+            ImageCollection("COPERNICUS/S2_SR_HARMONIZED")
+            .filterDate(
+                acq_date.advance(-days_around, "day"),
+                acq_date.advance(days_around, "day"),
+            )
+            .filterBounds(Geometry(feature.get("area_include_bounds")))
+        )
+        s2_clear = s2.filter(
+            Filter.lt("CLOUDY_PIXEL_PERCENTAGE", max_cloudy_percentage)
+        )
+
+        # work with whole UTC days, like `_get_image_metadata` does on the client
+        target_day = acq_date.millis().divide(MS_PER_DAY).floor()
+        days = s2.aggregate_array("system:time_start").map(
+            lambda ts: Number(ts).divide(MS_PER_DAY).floor()
+        )
+        clear_days = s2_clear.aggregate_array("system:time_start").map(
+            lambda ts: Number(ts).divide(MS_PER_DAY).floor()
+        )
+        days_before = clear_days.filter(Filter.lt("item", target_day))
+        days_after = clear_days.filter(Filter.gt("item", target_day))
+
+        imagery_available = (
+            days.filter(Filter.lt("item", target_day))
+            .size()
+            .gt(0)
+            .And(days.filter(Filter.gt("item", target_day)).size().gt(0))
+        )
+        clear_imagery_available = days_before.size().gt(0).And(days_after.size().gt(0))
+
+        before = Date(Number(days_before.reduce(Reducer.max())).multiply(MS_PER_DAY))
+        after = Date(Number(days_after.reduce(Reducer.min())).multiply(MS_PER_DAY))
+
+        before_image = cls._add_NBR(
+            s2_clear.filterDate(before, before.advance(1, "day"))
+            .first()
+            .clip(ee_aoi_bounds)
+        )
+        after_image = cls._add_NBR(
+            s2_clear.filterDate(after, after.advance(1, "day"))
+            .first()
+            .clip(ee_aoi_bounds)
+        )
+
+        nbr_difference = cls._get_nbr_difference(before_image, after_image)
+        nbr_mask = cls._get_nbr_mask(
+            after_image, nbr_difference, max_nbr_after, min_nbr_difference
+        )
+        nbr_masked = nbr_difference.updateMask(nbr_mask)
+
+        burnt_area_vector = cls._get_burnt_area_vector(
+            ee_aoi_bounds, nbr_mask, nbr_masked
+        )
+
+        analysis = {
+            "before_date": before.format("YYYY-MM-dd"),
+            "after_date": after.format("YYYY-MM-dd"),
+            "burnt_pixel_count": nbr_masked.reduceRegion(
+                reducer=Reducer.count(),
+                geometry=ee_aoi_bounds,
+                scale=10,
+            ).get("NBR"),
+        }
+        if count_buildings:
+            buildings = cls._get_buildings(ee_aoi_bounds)
+            burnt_buildings = cls._get_burnt_buildings(burnt_area_vector, buildings)
+            analysis["burnt_building_count"] = burnt_buildings.size()
+        else:
+            analysis["burnt_area"] = burnt_area_vector.geometry()
+
+        # `If` only evaluates the selected branch, so the analysis is skipped
+        # (and can't fail on missing images) when we stop early.
+        properties = ApiFunction.call_(
+            "If",
+            imagery_available.Not(),
+            Dictionary({"no_data": True}),
+            ApiFunction.call_(
+                "If",
+                clear_imagery_available.Not(),
+                Dictionary({"too_cloudy": True}),
+                Dictionary(analysis),
+            ),
+        )
+
+        return Feature(None, Dictionary(properties).set("index", feature.get("index")))
+
+    @staticmethod
+    def _parse_batch_result(
+        detection: FireDetection,
+        properties: dict[str, t.Any],
+        burnt_pixel_count_threshold: int,
+    ) -> ValidationResult:
+        result = ValidationResult(
+            firms_id=detection.firms_id,
+            acq_date=detection.acq_date,
+            no_data=properties.get("no_data", False),
+            too_cloudy=properties.get("too_cloudy", False),
+        )
+
+        if result.no_data or result.too_cloudy:
+            return result
+
+        result.before_date = datetime.date.fromisoformat(properties["before_date"])
+        result.after_date = datetime.date.fromisoformat(properties["after_date"])
+        result.burnt_pixel_count = expect_type(
+            properties.get("burnt_pixel_count"), int, 0
+        )
+        result.burnt_building_count = expect_type(
+            properties.get("burnt_building_count"), int, 0
+        )
+        result.burnt_area = parse_burnt_area(properties.get("burnt_area"))
+        result.burn_scar_detected = (
+            result.burnt_pixel_count > burnt_pixel_count_threshold
+        )
+
+        return result
+
+    def _get_imagery_selection(
+        self,
+        detection: FireDetection,
+        days_around: int = 30,
+        max_cloudy_percentage: int = 20,
+    ) -> ImagerySelection:
+        # fetch dates and cloudiness of all images in a single request, unless
+        # they were already looked up in the scene catalog
+        image_metadata = detection.image_metadata
+        if image_metadata is None:
+            s2 = self._get_s2_collection(detection, days_around)
+            image_metadata = self._get_image_metadata(image_collection=s2)
+
+        return self._select_imagery(
+            image_metadata, detection.acq_date, max_cloudy_percentage
+        )
+
     @staticmethod
     def _get_buildings(filter_bounds: Geometry) -> FeatureCollection:
         buildings = (
@@ -242,27 +980,28 @@ class GEEValidator:
 
         return burnt_buildings
 
-    @staticmethod
     def _get_burnt_building_count(
+        self,
         burnt_buildings: FeatureCollection,
     ) -> int:
-        burnt_building_count = burnt_buildings.size().getInfo()
+        burnt_building_count = self._get_info(
+            burnt_buildings.size(), stage="burnt_building_count"
+        )
         burnt_building_count = expect_type(burnt_building_count, int, 0)
         return burnt_building_count
 
-    @staticmethod
     def _get_burnt_pixel_count(
+        self,
         ee_aoi_bounds: Geometry,
         nbr_masked: Image,
     ) -> int:
-        burnt_pixel_count = (
+        burnt_pixel_count = self._get_info(
             nbr_masked.reduceRegion(
                 reducer=Reducer.count(),
                 geometry=ee_aoi_bounds,
                 scale=10,
-            )
-            .get("NBR")
-            .getInfo()
+            ).get("NBR"),
+            stage="burnt_pixel_count",
         )
         burnt_pixel_count = expect_type(burnt_pixel_count, int, 0)
         return burnt_pixel_count
@@ -278,28 +1017,62 @@ class GEEValidator:
         ee_aoi_bounds = ee_point.buffer(distance=buffer_distance).bounds()
         return ee_aoi_bounds
 
-    @staticmethod
+    @classmethod
     def _get_s2_collection(
+        cls,
         detection: FireDetection,
         days_around: int,
+    ) -> ImageCollection:
+        date_window = datetime.timedelta(days=days_around)
+        return cls._filter_s2_collection(
+            detection.area_include_geom,
+            start_date=detection.acq_date - date_window,
+            end_date=detection.acq_date + date_window,
+        )
+
+    @staticmethod
+    def _filter_s2_collection(
+        area_include_geom: ShapelyPolygon,
+        start_date: datetime.date,
+        end_date: datetime.date,
     ) -> ImageCollection:
         ee_area_include_bounds = Geometry.Polygon(
-            list(detection.area_include_geom.exterior.coords)
+            list(area_include_geom.exterior.coords)
         ).bounds()
 
         # fitler collections
-        date_window = datetime.timedelta(days=days_around)
-        start_date = str(detection.acq_date - date_window)
-        end_date = str(detection.acq_date + date_window)
-
         s2: ImageCollection = (
             ImageCollection("COPERNICUS/S2_SR_HARMONIZED")
-            .filterDate(start_date, end_date)
+            .filterDate(str(start_date), str(end_date))
             .filterBounds(ee_area_include_bounds)
         )
 
         return s2
 
+    @classmethod
+    def _get_selected_images(
+        cls,
+        area_include_geom: ShapelyPolygon,
+        clipping_bounds: Geometry,
+        selection: ImagerySelection,
+        max_cloudy_percentage: int,
+    ) -> tuple[Image, Image]:
+        """First clear image on the selected before and after dates, with NBR."""
+        before, after = selection.before_date, selection.after_date
+        assert before and after, "Imagery selection is missing dates"
+
+        s2 = cls._filter_s2_collection(
+            area_include_geom,
+            start_date=before,
+            end_date=after + datetime.timedelta(days=1),
+        ).filter(Filter.lt("CLOUDY_PIXEL_PERCENTAGE", max_cloudy_percentage))
+
+        before_image = cls._add_NBR(
+            cls._get_image_for_date(clipping_bounds, s2, before)
+        )
+        after_image = cls._add_NBR(cls._get_image_for_date(clipping_bounds, s2, after))
+        return before_image, after_image
+
     @staticmethod
     def _get_image_for_date(
         clipping_bounds: Geometry,
@@ -316,13 +1089,48 @@ class GEEValidator:
 
         return image
 
-    @staticmethod
-    def _get_image_dates(image_collection: ImageCollection) -> list[datetime.date]:
-        image_dates = image_collection.aggregate_array("system:time_start").getInfo()
-        image_dates = expect_type(image_dates, list, [])
-        return list(
-            map(lambda ts: datetime.date.fromtimestamp(ts / 1000.0), image_dates)
+    def _get_image_metadata(
+        self,
+        image_collection: ImageCollection,
+    ) -> list[tuple[datetime.date, float]]:
+        """Dates and cloud cover of all images in the collection, in one request."""
+        image_metadata = self._get_info(
+            image_collection.reduceColumns(
+                reducer=Reducer.toList(2),
+                selectors=["system:time_start", "CLOUDY_PIXEL_PERCENTAGE"],
+            ).get("list"),
+            stage="image_metadata",
+        )
+        image_metadata = expect_type(image_metadata, list, [])
+        return [
+            (date_from_millis(ts), cloudy_pixel_percentage)
+            for ts, cloudy_pixel_percentage in image_metadata
+        ]
+
+    @classmethod
+    def _select_imagery(
+        cls,
+        image_metadata: list[tuple[datetime.date, float]],
+        target_date: datetime.date,
+        max_cloudy_percentage: float,
+    ) -> ImagerySelection:
+        image_dates = [date for date, _ in image_metadata]
+        if not cls._imagery_available(image_dates, target_date):
+            return ImagerySelection(no_data=True)
+
+        # same as filtering the collection on CLOUDY_PIXEL_PERCENTAGE
+        clear_image_dates = [
+            date
+            for date, cloudy_pixel_percentage in image_metadata
+            if cloudy_pixel_percentage < max_cloudy_percentage
+        ]
+        if not cls._imagery_available(clear_image_dates, target_date):
+            return ImagerySelection(too_cloudy=True)
+
+        before, after = cls._get_nearest_surrounding_dates(
+            target_date, clear_image_dates
         )
+        return ImagerySelection(before_date=before, after_date=after)
 
     @staticmethod
     def _imagery_available(
@@ -0,0 +1,92 @@
+import math
+
+import shapely
+from shapely import Polygon, STRtree, box
+
+from ..models import FireDetection
+
+METERS_PER_DEGREE = 111_320
+
+# limits of a group validated in a single request, chains of overlapping
+# detections in dense clusters would otherwise hit Earth Engine's memory limits
+MAX_GROUP_SIZE = 50
+MAX_GROUP_EXTENT = 10_000  # meters
+
+
+def get_aoi_bounds(detection: FireDetection, buffer_distance: int) -> Polygon:
+    """
+    Local approximation of the square Area of Interest used on Earth Engine,
+    the bounds of the detection buffered by `buffer_distance` meters.
+    """
+    x, y = detection.geom.x, detection.geom.y
+    dy = buffer_distance / METERS_PER_DEGREE
+    dx = buffer_distance / (METERS_PER_DEGREE * math.cos(math.radians(y)))
+    return box(x - dx, y - dy, x + dx, y + dy)
+
+
+def group_overlapping(
+    polygons: list[Polygon],
+    max_size: int | None = None,
+    max_extent: float | None = None,
+) -> list[list[int]]:
+    """
+    Group polygons that overlap, directly or through other polygons.
+
+    Groups with more than `max_size` polygons, or wider or taller than
+    `max_extent` (in the units of the polygons), are split in halves along
+    their longest side until they fit. Returns groups of indices into
+    `polygons`, ordered by their first index.
+    """
+    parents = list(range(len(polygons)))
+
+    def find(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    tree = STRtree(polygons)
+    for i, j in zip(*tree.query(polygons, predicate="intersects")):
+        root_i, root_j = find(int(i)), find(int(j))
+        if root_i != root_j:
+            parents[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(polygons)):
+        groups.setdefault(find(i), []).append(i)
+
+    return sorted(
+        (
+            part
+            for group in groups.values()
+            for part in split_group(group, polygons, max_size, max_extent)
+        ),
+        key=lambda group: group[0],
+    )
+
+
+def split_group(
+    group: list[int],
+    polygons: list[Polygon],
+    max_size: int | None = None,
+    max_extent: float | None = None,
+) -> list[list[int]]:
+    min_x, min_y, max_x, max_y = shapely.total_bounds([polygons[i] for i in group])
+    width, height = max_x - min_x, max_y - min_y
+
+    too_large = max_size is not None and len(group) > max_size
+    too_wide = max_extent is not None and max(width, height) > max_extent
+    if len(group) == 1 or not (too_large or too_wide):
+        return [group]
+
+    axis = 0 if width >= height else 1
+    ordered = sorted(
+        group, key=lambda i: shapely.get_coordinates(polygons[i].centroid)[0][axis]
+    )
+    half = len(ordered) // 2
+
+    return [
+        sorted(part)
+        for side in (ordered[:half], ordered[half:])
+        for part in split_group(side, polygons, max_size, max_extent)
+    ]
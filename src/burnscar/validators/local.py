@@ -0,0 +1,281 @@
+import datetime
+import logging
+import typing as t
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..models import FireDetection
+from ..utils import chunked, map_bounded
+from .gee import GEEValidator, ValidationResult
+
+logger = logging.getLogger(__name__)
+
+# Sentinel-2 B8 and B12 are analysed at 10 meters, like on Earth Engine
+SCALE = 10
+
+
+class Chip(BaseModel):
+    class Config:
+        arbitrary_types_allowed = True
+
+    dates: list[datetime.date]
+    cloudy_pixel_percentage: list[float]
+    b8: np.ndarray  # (images, height, width)
+    b12: np.ndarray  # (images, height, width)
+    buildings: np.ndarray | None = None  # (height, width), building ids, 0 is none
+
+
+class ChipBands(t.NamedTuple):
+    """Before and after bands of a detection in a batch, cropped to its buffer."""
+
+    result_index: int
+    b8_before: np.ndarray
+    b12_before: np.ndarray
+    b8_after: np.ndarray
+    b12_after: np.ndarray
+    buildings: np.ndarray
+
+
+class ChipStore:
+    """
+    Sentinel-2 chips centered on detections, stored as NPZ files.
+
+    Each file holds `dates` (datetime64[D]), `cloudy_pixel_percentage`, the `B8`
+    and `B12` bands stacked as (images, height, width) at 10 meters, and
+    optionally `buildings`, a (height, width) raster of building ids.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+
+    def _chip_path(self, firms_id: int, acq_date: datetime.date) -> Path:
+        return self.path / f"{firms_id}_{acq_date}.npz"
+
+    def exists(self, firms_id: int, acq_date: datetime.date) -> bool:
+        return self._chip_path(firms_id, acq_date).exists()
+
+    def load(self, firms_id: int, acq_date: datetime.date) -> Chip | None:
+        path = self._chip_path(firms_id, acq_date)
+        if not path.exists():
+            return None
+
+        with np.load(path) as data:
+            return Chip(
+                dates=data["dates"].astype("datetime64[D]").tolist(),
+                cloudy_pixel_percentage=data["cloudy_pixel_percentage"].tolist(),
+                b8=data["B8"],
+                b12=data["B12"],
+                buildings=data["buildings"] if "buildings" in data else None,
+            )
+
+    def save(self, firms_id: int, acq_date: datetime.date, chip: Chip):
+        self.path.mkdir(parents=True, exist_ok=True)
+        arrays: dict[str, t.Any] = dict(
+            dates=np.array(chip.dates, dtype="datetime64[D]"),
+            cloudy_pixel_percentage=np.array(chip.cloudy_pixel_percentage),
+            B8=chip.b8,
+            B12=chip.b12,
+        )
+        if chip.buildings is not None:
+            arrays["buildings"] = chip.buildings
+
+        np.savez_compressed(self._chip_path(firms_id, acq_date), **arrays)
+
+
+def crop_to_buffer(array: np.ndarray, buffer_distance: int) -> np.ndarray:
+    """Crop the last two axes to `buffer_distance` meters around the center."""
+    height, width = array.shape[-2:]
+    half = round(buffer_distance / SCALE)
+    center_y, center_x = height // 2, width // 2
+    return array[
+        ...,
+        max(center_y - half, 0) : center_y + half,
+        max(center_x - half, 0) : center_x + half,
+    ]
+
+
+def get_nbr(nir: np.ndarray, swir: np.ndarray) -> np.ndarray:
+    """Normalized Burn Ratio, NaN where there is no data."""
+    nir = nir.astype(np.float32)
+    swir = swir.astype(np.float32)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (nir - swir) / (nir + swir)
+
+
+def get_nbr_mask(
+    before_nbr: np.ndarray,
+    after_nbr: np.ndarray,
+    max_nbr_after: float,
+    min_nbr_difference: float,
+) -> np.ndarray:
+    nbr_difference = before_nbr - after_nbr
+    return (nbr_difference >= min_nbr_difference) & (after_nbr <= max_nbr_after)
+
+
+class LocalValidator:
+    """
+    Validator running the NBR analysis of `GEEValidator` with NumPy on local
+    chips, without Earth Engine or network access.
+
+    Chips of a batch are stacked, so the analysis of many Areas of Interest runs
+    as a few array operations. Burnt buildings are the buildings in the chip's
+    building raster with at least one burnt pixel.
+    """
+
+    def __init__(self, chip_store: ChipStore):
+        self.chip_store = chip_store
+
+    def validate_many(
+        self,
+        detections: t.Iterable[FireDetection],
+        validation_params: dict,
+        max_workers: int = 10,
+        batch_size: int = 256,
+    ) -> t.Generator[ValidationResult, None, None]:
+        def safe_validate_batch(batch: list[FireDetection]) -> list[ValidationResult]:
+            try:
+                return self.validate_batch(batch, **validation_params)
+            except Exception as e:
+                firms_ids = [detection.firms_id for detection in batch]
+                logger.error(f"Validation failed for FIRMS IDs {firms_ids}: {e}")
+                return [
+                    ValidationResult(
+                        firms_id=detection.firms_id,
+                        acq_date=detection.acq_date,
+                        no_data=True,
+                    )
+                    for detection in batch
+                ]
+
+        for results in map_bounded(
+            safe_validate_batch,
+            chunked(detections, batch_size),
+            max_workers,
+        ):
+            yield from results
+
+    def validate(
+        self,
+        detection: FireDetection,
+        buffer_distance: int = 1000,
+        days_around: int = 30,
+        max_cloudy_percentage: int = 20,
+        burnt_pixel_count_threshold: int = 10,
+        max_nbr_after: float = -0.10,
+        min_nbr_difference: float = 0.15,
+    ) -> ValidationResult:
+        [result] = self.validate_batch(
+            [detection],
+            buffer_distance=buffer_distance,
+            days_around=days_around,
+            max_cloudy_percentage=max_cloudy_percentage,
+            burnt_pixel_count_threshold=burnt_pixel_count_threshold,
+            max_nbr_after=max_nbr_after,
+            min_nbr_difference=min_nbr_difference,
+        )
+        return result
+
+    def validate_batch(
+        self,
+        detections: list[FireDetection],
+        buffer_distance: int = 1000,
+        days_around: int = 30,
+        max_cloudy_percentage: int = 20,
+        burnt_pixel_count_threshold: int = 10,
+        max_nbr_after: float = -0.10,
+        min_nbr_difference: float = 0.15,
+    ) -> list[ValidationResult]:
+        results = [
+            ValidationResult(firms_id=detection.firms_id, acq_date=detection.acq_date)
+            for detection in detections
+        ]
+
+        # select imagery for each detection, and collect the before and after
+        # bands of those we can analyse, grouped by chip shape for stacking
+        stacks: dict[tuple[int, ...], list[ChipBands]] = {}
+        for index, detection in enumerate(detections):
+            result = results[index]
+            chip = self.chip_store.load(detection.firms_id, detection.acq_date)
+            if chip is None:
+                logger.warning(f"No chip for FIRMS ID {detection.firms_id}")
+                result.no_data = True
+                continue
+
+            window = datetime.timedelta(days=days_around)
+            image_metadata = [
+                (date, cloudy_pixel_percentage)
+                for date, cloudy_pixel_percentage in zip(
+                    chip.dates, chip.cloudy_pixel_percentage
+                )
+                if detection.acq_date - window <= date < detection.acq_date + window
+            ]
+            selection = GEEValidator._select_imagery(
+                image_metadata, detection.acq_date, max_cloudy_percentage
+            )
+            if selection.no_data or selection.too_cloudy:
+                result.no_data = selection.no_data
+                result.too_cloudy = selection.too_cloudy
+                continue
+
+            result.before_date = selection.before_date
+            result.after_date = selection.after_date
+
+            # first clear image of the day, like `first()` on Earth Engine
+            before, after = (
+                next(
+                    i
+                    for i, (d, c) in enumerate(
+                        zip(chip.dates, chip.cloudy_pixel_percentage)
+                    )
+                    if d == date and c < max_cloudy_percentage
+                )
+                for date in (selection.before_date, selection.after_date)
+            )
+
+            b8_before = crop_to_buffer(chip.b8[before], buffer_distance)
+            bands = ChipBands(
+                result_index=index,
+                b8_before=b8_before,
+                b12_before=crop_to_buffer(chip.b12[before], buffer_distance),
+                b8_after=crop_to_buffer(chip.b8[after], buffer_distance),
+                b12_after=crop_to_buffer(chip.b12[after], buffer_distance),
+                buildings=(
+                    crop_to_buffer(chip.buildings, buffer_distance)
+                    if chip.buildings is not None
+                    else np.zeros(b8_before.shape, dtype=np.int64)
+                ),
+            )
+            stacks.setdefault(b8_before.shape, []).append(bands)
+
+        for stack in stacks.values():
+            nbr_mask = get_nbr_mask(
+                get_nbr(
+                    np.stack([c.b8_before for c in stack]),
+                    np.stack([c.b12_before for c in stack]),
+                ),
+                get_nbr(
+                    np.stack([c.b8_after for c in stack]),
+                    np.stack([c.b12_after for c in stack]),
+                ),
+                max_nbr_after,
+                min_nbr_difference,
+            )
+            burnt_pixel_counts = nbr_mask.sum(axis=(1, 2))
+
+            burnt_building_ids = np.where(
+                nbr_mask, np.stack([c.buildings for c in stack]), 0
+            )
+
+            for i, bands in enumerate(stack):
+                result = results[bands.result_index]
+                result.burnt_pixel_count = int(burnt_pixel_counts[i])
+                result.burnt_building_count = int(
+                    np.count_nonzero(np.unique(burnt_building_ids[i]))
+                )
+                result.burn_scar_detected = (
+                    result.burnt_pixel_count > burnt_pixel_count_threshold
+                )
+
+        return results
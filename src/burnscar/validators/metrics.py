@@ -0,0 +1,141 @@
+import datetime
+import threading
+import time
+import typing as t
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from .retry import ErrorClass
+
+METRICS_COLUMNS = {
+    "run_id": "text",
+    "recorded_at": "timestamp",
+    "firms_id": "bigint",
+    "stage": "text",
+    "seconds": "double",
+    "requests": "int",
+    "retries": "int",
+    "error_class": "text",
+    "detections": "int",
+}
+
+
+class ValidationMetrics:
+    """
+    Wall time, Earth Engine requests, retries and errors per detection and
+    stage of the validation.
+
+    Stages are named after the request that is made, which is where Earth
+    Engine does the work: the `reduceToVectors` of the burnt area is part of
+    `burnt_building_count`. The `total` stage is the whole validation of a
+    detection, recorded once per detection. Requests for a batch or group of
+    detections are recorded for each of them, with the number of detections
+    sharing the request.
+    """
+
+    def __init__(self):
+        self.run_id = str(uuid.uuid4())
+        self.rows: list[dict[str, t.Any]] = []
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _record(self, stage: str, seconds: float, **counts: t.Any):
+        firms_ids = getattr(self._local, "firms_ids", None) or [None]
+        recorded_at = datetime.datetime.now()
+
+        with self._lock:
+            self.rows += [
+                dict(
+                    run_id=self.run_id,
+                    recorded_at=recorded_at,
+                    firms_id=firms_id,
+                    stage=stage,
+                    seconds=seconds,
+                    detections=len(firms_ids),
+                    **counts,
+                )
+                for firms_id in firms_ids
+            ]
+
+    @contextmanager
+    def detections(self, firms_ids: list[int], total: bool = True) -> t.Iterator[None]:
+        """
+        Attribute the stages within to these detections, and time them as their
+        `total` unless `total` is False.
+        """
+        previous = getattr(self._local, "firms_ids", None)
+        self._local.firms_ids = firms_ids
+
+        t0 = time.monotonic()
+        try:
+            yield
+        finally:
+            if total:
+                self._record(
+                    "total",
+                    time.monotonic() - t0,
+                    requests=0,
+                    retries=0,
+                    error_class=None,
+                )
+            self._local.firms_ids = previous
+
+    @contextmanager
+    def stage(self, name: str) -> t.Iterator[None]:
+        self._local.requests = 0
+        self._local.errors = []
+
+        t0 = time.monotonic()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            errors: list[ErrorClass] = self._local.errors
+            self._record(
+                name,
+                time.monotonic() - t0,
+                requests=self._local.requests,
+                # the last error isn't retried when the stage fails
+                retries=max(len(errors) - failed, 0),
+                error_class=str(errors[-1]) if errors else None,
+            )
+
+    def on_request(self):
+        self._local.requests = getattr(self._local, "requests", 0) + 1
+
+    def on_error(self, error_class: ErrorClass):
+        if hasattr(self._local, "errors"):
+            self._local.errors.append(error_class)
+
+    def drain(self) -> pd.DataFrame:
+        """Recorded metrics, which are then cleared to keep memory flat."""
+        with self._lock:
+            rows, self.rows = self.rows, []
+
+        return pd.DataFrame(rows, columns=list(METRICS_COLUMNS))
+
+
+def write_metrics(metrics_df: pd.DataFrame, path: Path):
+    """Append metrics to a csv file, with a header when the file is new."""
+    if metrics_df.empty:
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    metrics_df.to_csv(path, mode="a", header=not path.exists(), index=False)
+
+
+def summarize_metrics(metrics_df: pd.DataFrame) -> pd.DataFrame:
+    """Wall time, requests, retries and detections per stage."""
+    return metrics_df.groupby("stage").agg(
+        seconds=("seconds", "sum"),
+        requests=("requests", "sum"),
+        retries=("retries", "sum"),
+        detections=("firms_id", "nunique"),
+    )
@@ -0,0 +1,133 @@
+import json
+import logging
+import random
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+import ee
+from ee.computedobject import ComputedObject
+
+from . import gee
+from .cache import RequestCache
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS_FILE = "algorithms.json"
+
+
+class Replay:
+    """
+    Record and replay of the Earth Engine requests made by the validators.
+
+    In `record` mode, requests go to Earth Engine and the responses are written
+    to `path`, keyed by the serialized expression like `RequestCache`. In
+    `replay` mode, responses are served from `path` without credentials or
+    network, after `latency` seconds plus up to `jitter` seconds. Without
+    `latency`, the latency measured while recording is used. Requests that were
+    not recorded raise a `LookupError`.
+
+    Use it as a context manager around creating and using the validators.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        mode: t.Literal["record", "replay"] = "replay",
+        latency: float | None = None,
+        jitter: float = 0.0,
+    ):
+        assert mode in ("record", "replay"), f"Unknown replay mode: {mode}"
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+
+        self._lock = threading.Lock()
+        self._patched: list[tuple[t.Any, str, t.Any]] = []
+
+        # round trips and their latencies, in seconds
+        self.latencies: list[float] = []
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.latencies)
+
+    def __enter__(self) -> "Replay":
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._patch(ee.data, "computeValue", self._compute_value)
+        self._patch(gee, "initialize", self._initialize)
+        return self
+
+    def __exit__(self, *exc_info):
+        while self._patched:
+            obj, name, original = self._patched.pop()
+            setattr(obj, name, original)
+
+    def _patch(self, obj: t.Any, name: str, replacement: t.Any):
+        self._patched.append((obj, name, getattr(obj, name)))
+        setattr(obj, name, replacement)
+
+    def _original(self, obj: t.Any, name: str) -> t.Any:
+        return next(o for p, n, o in reversed(self._patched) if (p, n) == (obj, name))
+
+    def _initialize(self, key_path: Path) -> None:
+        algorithms_path = self.path / ALGORITHMS_FILE
+        get_algorithms = ee.data.getAlgorithms
+
+        if self.mode == "record":
+            # keep the algorithm signatures, the client needs them to build
+            # expressions when replaying
+            def record_algorithms() -> t.Any:
+                algorithms = get_algorithms()
+                algorithms_path.write_text(json.dumps(algorithms))
+                return algorithms
+
+            ee.data.getAlgorithms = record_algorithms
+            try:
+                self._original(gee, "initialize")(key_path)
+            finally:
+                ee.data.getAlgorithms = get_algorithms
+            return
+
+        if not algorithms_path.exists():
+            raise LookupError(f"No recorded algorithms in {self.path}")
+
+        data_initialize = ee.data.initialize
+        ee.data.initialize = lambda **kwargs: None
+        ee.data.getAlgorithms = lambda: json.loads(algorithms_path.read_text())
+        try:
+            ee.Initialize(credentials=None, project="replay")
+        finally:
+            ee.data.initialize = data_initialize
+            ee.data.getAlgorithms = get_algorithms
+
+    def _compute_value(self, obj: ComputedObject) -> t.Any:
+        key = RequestCache.key(obj)
+        response_path = self.path / key[:2] / f"{key}.json"
+
+        t0 = time.monotonic()
+        if self.mode == "record":
+            value = self._original(ee.data, "computeValue")(obj)
+            latency = time.monotonic() - t0
+
+            response_path.parent.mkdir(parents=True, exist_ok=True)
+            response_path.write_text(json.dumps({"value": value, "latency": latency}))
+
+        else:
+            if not response_path.exists():
+                raise LookupError(f"No recorded response for request {key}")
+
+            recording = json.loads(response_path.read_text())
+            value = recording["value"]
+
+            delay = self.latency if self.latency is not None else recording["latency"]
+            time.sleep(delay + random.uniform(0, self.jitter))
+            latency = time.monotonic() - t0
+
+        with self._lock:
+            self.latencies.append(latency)
+
+        return value
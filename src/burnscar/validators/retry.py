@@ -0,0 +1,141 @@
+import logging
+import random
+import threading
+import time
+import typing as t
+from collections import Counter
+from enum import StrEnum
+
+logger = logging.getLogger(__name__)
+
+T = t.TypeVar("T")
+
+
+class ErrorClass(StrEnum):
+    quota = "quota"
+    transient = "transient"
+    permanent = "permanent"
+
+
+QUOTA_ERROR_MESSAGES = (
+    "too many concurrent aggregations",
+    "too many requests",
+    "quota exceeded",
+    "rate limit",
+    "429",
+)
+
+TRANSIENT_ERROR_MESSAGES = (
+    "internal error",
+    "service unavailable",
+    "deadline exceeded",
+    "connection reset",
+    "connection aborted",
+    "502",
+    "503",
+    "504",
+)
+
+
+def classify_error(error: Exception) -> ErrorClass:
+    """
+    Tell Earth Engine errors apart by whether retrying them makes sense.
+
+    Anything we don't recognise, like invalid arguments or computations that
+    time out on the server, is considered permanent.
+    """
+    message = str(error).lower()
+
+    if any(m in message for m in QUOTA_ERROR_MESSAGES):
+        return ErrorClass.quota
+
+    if isinstance(error, (ConnectionError, TimeoutError)) or any(
+        m in message for m in TRANSIENT_ERROR_MESSAGES
+    ):
+        return ErrorClass.transient
+
+    return ErrorClass.permanent
+
+
+class RetryPolicy:
+    """
+    Retry calls on quota and transient errors, with jittered exponential backoff.
+
+    A quota error starts a cool-down that is shared by all threads using the
+    policy, so they don't hit the quota again all at once. Outcomes are counted
+    in `counts`, and every error is passed to `on_error`, if set, as well as to
+    the hook of the call.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 2.0,
+        max_delay: float = 60.0,
+        on_error: t.Callable[[ErrorClass], None] | None = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.on_error = on_error
+
+        self.counts: Counter[str] = Counter()
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    def _count(self, outcome: str):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def _backoff(self, attempt: int) -> float:
+        # "full jitter", spreads retries of threads that failed together
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def _wait_for_cooldown(self):
+        with self._lock:
+            remaining = self._cooldown_until - time.monotonic()
+
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _start_cooldown(self, delay: float):
+        with self._lock:
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+
+    def call(
+        self,
+        func: t.Callable[[], T],
+        on_error: t.Callable[[ErrorClass], None] | None = None,
+    ) -> T:
+        for attempt in range(1, self.max_attempts + 1):
+            self._wait_for_cooldown()
+
+            try:
+                result = func()
+                self._count("success")
+                return result
+
+            except Exception as e:
+                error_class = classify_error(e)
+                if on_error is not None:
+                    on_error(error_class)
+                if self.on_error is not None:
+                    self.on_error(error_class)
+
+                if error_class == ErrorClass.permanent or attempt == self.max_attempts:
+                    self._count(f"failed_{error_class}")
+                    raise
+
+                self._count(f"retried_{error_class}")
+                delay = self._backoff(attempt)
+                logger.warning(
+                    f"{error_class.capitalize()} error on attempt {attempt}, "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+
+                if error_class == ErrorClass.quota:
+                    self._start_cooldown(delay)
+                else:
+                    time.sleep(delay)
+
+        raise AssertionError("unreachable")
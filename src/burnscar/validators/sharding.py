@@ -0,0 +1,293 @@
+import logging
+import multiprocessing
+import typing as t
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+
+from ..models import FireDetection
+from ..utils import chunked
+from .cache import RequestCache
+from .gee import (
+    GEEValidator,
+    ValidationResult,
+    ValidationSummary,
+    complete_validation_params,
+)
+from .grouping import (
+    MAX_GROUP_EXTENT,
+    MAX_GROUP_SIZE,
+    METERS_PER_DEGREE,
+    get_aoi_bounds,
+    group_overlapping,
+)
+from .metrics import ValidationMetrics
+from .retry import RetryPolicy
+from .store import ResultStore
+
+logger = logging.getLogger(__name__)
+
+# a detection in several include areas is validated for each of them
+DetectionKey = tuple[int, str | None]
+
+# the validator of a worker process, set up once by `initialize_worker`
+_validator: GEEValidator | None = None
+
+
+def detection_key(detection: FireDetection) -> DetectionKey:
+    return detection.firms_id, detection.area_include_id
+
+
+class ChunkResult(t.NamedTuple):
+    results: list[tuple[DetectionKey, ValidationSummary]]
+    metrics: pd.DataFrame
+    retry_counts: Counter[str]
+
+
+def initialize_worker(
+    key_path: Path,
+    count_buildings: bool = True,
+    cache: dict | None = None,
+    retry: dict | None = None,
+):
+    """Start an Earth Engine session for a single service account."""
+    global _validator
+    _validator = GEEValidator(
+        key_path=key_path,
+        cache=RequestCache(**(cache or {})),
+        retry_policy=RetryPolicy(**(retry or {})),
+        count_buildings=count_buildings,
+        metrics=ValidationMetrics(),
+    )
+
+
+def validate_chunk(
+    detections: list[FireDetection],
+    validation_params: dict,
+    max_workers: int = 10,
+    batch_size: int | None = None,
+    group: bool = False,
+) -> ChunkResult:
+    """Validate a chunk of detections with the validator of this process."""
+    assert _validator is not None, "Worker is not initialized"
+    assert _validator.metrics is not None
+
+    # results only carry the FIRMS ID, so a detection that is in several
+    # include areas is validated in separate rounds
+    rounds: list[dict[int, FireDetection]] = []
+    for detection in detections:
+        for round_ in rounds:
+            if detection.firms_id not in round_:
+                round_[detection.firms_id] = detection
+                break
+        else:
+            rounds.append({detection.firms_id: detection})
+
+    results = []
+    for round_ in rounds:
+        for result in _validator.validate_many(
+            list(round_.values()),
+            validation_params=validation_params,
+            max_workers=max_workers,
+            batch_size=batch_size,
+            group=group,
+            lean=True,
+        ):
+            assert isinstance(result, ValidationSummary)
+            results.append((detection_key(round_[result.firms_id]), result))
+
+    retry_counts = Counter(_validator.retry_policy.counts)
+    _validator.retry_policy.counts.clear()
+
+    return ChunkResult(
+        results=results,
+        metrics=_validator.metrics.drain(),
+        retry_counts=retry_counts,
+    )
+
+
+def plan_chunks(
+    detections: list[FireDetection],
+    chunk_size: int,
+    buffer_distance: int = 1000,
+) -> list[list[FireDetection]]:
+    """
+    Split detections into chunks of whole groups of overlapping detections in
+    the same include area, so grouped validation still sees every neighbour.
+    """
+    by_area: dict[bytes, list[FireDetection]] = {}
+    for detection in detections:
+        by_area.setdefault(detection.area_include_geom.wkb, []).append(detection)
+
+    chunks: list[list[FireDetection]] = [[]]
+    for area_detections in by_area.values():
+        aois = [get_aoi_bounds(d, buffer_distance) for d in area_detections]
+        for indices in group_overlapping(
+            aois,
+            max_size=MAX_GROUP_SIZE,
+            max_extent=MAX_GROUP_EXTENT / METERS_PER_DEGREE,
+        ):
+            if len(chunks[-1]) + len(indices) > chunk_size and chunks[-1]:
+                chunks.append([])
+            chunks[-1] += [area_detections[i] for i in indices]
+
+    return [chunk for chunk in chunks if chunk]
+
+
+class ShardedValidator:
+    """
+    Spread validations over several service accounts, to scale beyond the
+    Earth Engine quota of a single project.
+
+    Every key gets its own process and Earth Engine session, validating chunks
+    of nearby detections with up to `max_workers` threads. Detections are read
+    in windows of `window` detections, whose results are yielded in FIRMS ID
+    order once the window completes, so memory doesn't grow with the number of
+    detections. Stored results are looked up and written by this process, as a
+    DuckDB file can't be written from several processes, and results are stored
+    as soon as their chunk completes. Detections of a chunk that fails are
+    returned as `no_data`, like `GEEValidator.validate_many` does.
+    """
+
+    def __init__(
+        self,
+        key_paths: list[Path],
+        store: ResultStore | None = None,
+        count_buildings: bool = True,
+        cache: dict | None = None,
+        retry: dict | None = None,
+        chunk_size: int = 500,
+    ):
+        assert key_paths, "At least one Earth Engine key is needed"
+
+        self.key_paths = key_paths
+        self.store = store
+        self.count_buildings = count_buildings
+        self.cache = cache
+        self.retry = retry
+        self.chunk_size = chunk_size
+
+        self.metrics: list[pd.DataFrame] = []
+        self.retry_counts: Counter[str] = Counter()
+
+    # worker functions, run in the processes of the service accounts
+    initialize_worker = staticmethod(initialize_worker)
+    validate_chunk = staticmethod(validate_chunk)
+
+    def validate_many(
+        self,
+        detections: t.Iterable[FireDetection],
+        validation_params: dict,
+        max_workers: int = 10,
+        batch_size: int | None = None,
+        group: bool = False,
+        window: int | None = None,
+    ) -> t.Generator[ValidationSummary, None, None]:
+        # by default a few chunks per service account, to balance their load
+        window = window or 4 * self.chunk_size * len(self.key_paths)
+
+        # spawn, as forking a process with threads running isn't safe
+        executors = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initialize_worker,
+                initargs=(key_path, self.count_buildings, self.cache, self.retry),
+            )
+            for key_path in self.key_paths
+        ]
+        try:
+            for window_detections in chunked(detections, window):
+                results = self._validate_window(
+                    executors,
+                    window_detections,
+                    validation_params,
+                    max_workers,
+                    batch_size,
+                    group,
+                )
+                for key in sorted(results, key=lambda key: (key[0], key[1] or "")):
+                    yield results[key]
+
+        finally:
+            for executor in executors:
+                executor.shutdown(cancel_futures=True)
+
+    def _validate_window(
+        self,
+        executors: list[ProcessPoolExecutor],
+        detections: list[FireDetection],
+        validation_params: dict,
+        max_workers: int,
+        batch_size: int | None,
+        group: bool,
+    ) -> dict[DetectionKey, ValidationSummary]:
+        stored_params = complete_validation_params(
+            validation_params, self.count_buildings
+        )
+
+        results: dict[DetectionKey, ValidationSummary] = {}
+        pending: dict[DetectionKey, FireDetection] = {}
+        for detection in detections:
+            stored = (
+                self.store.get(detection, stored_params)
+                if self.store is not None
+                else None
+            )
+            if stored is None:
+                pending[detection_key(detection)] = detection
+            else:
+                results[detection_key(detection)] = ValidationSummary(stored)
+
+        chunks = plan_chunks(
+            list(pending.values()),
+            self.chunk_size,
+            validation_params.get("buffer_distance", 1000),
+        )
+
+        # chunks go to the service account with the fewest detections
+        load = [0] * len(executors)
+        not_done: dict[Future, list[FireDetection]] = {}
+        for chunk in sorted(chunks, key=len, reverse=True):
+            shard = load.index(min(load))
+            load[shard] += len(chunk)
+            future = executors[shard].submit(
+                self.validate_chunk,
+                chunk,
+                validation_params,
+                max_workers,
+                batch_size,
+                group,
+            )
+            not_done[future] = chunk
+
+        while not_done:
+            done, _ = wait(not_done, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = not_done.pop(future)
+                try:
+                    chunk_result = future.result()
+                except Exception as e:
+                    firms_ids = [detection.firms_id for detection in chunk]
+                    logger.error(f"Validation failed for FIRMS IDs {firms_ids}: {e}")
+                    for detection in chunk:
+                        results[detection_key(detection)] = ValidationSummary(
+                            ValidationResult(
+                                firms_id=detection.firms_id,
+                                acq_date=detection.acq_date,
+                                no_data=True,
+                            )
+                        )
+                    continue
+
+                self.metrics.append(chunk_result.metrics)
+                self.retry_counts.update(chunk_result.retry_counts)
+
+                for key, result in chunk_result.results:
+                    if self.store is not None:
+                        self.store.put(pending[key], stored_params, result)
+                    results[key] = result
+
+        return results
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+import duckdb
+
+from ..models import FireDetection
+from .gee import ValidationResult, ValidationSummary
+
+logger = logging.getLogger(__name__)
+
+RESULT_FIELDS = (
+    "firms_id",
+    "acq_date",
+    "before_date",
+    "after_date",
+    "burn_scar_detected",
+    "burnt_pixel_count",
+    "burnt_building_count",
+    "burnt_area",
+    "no_data",
+    "too_cloudy",
+)
+
+
+def hash_params(validation_params: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(validation_params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def detection_key(detection: FireDetection, params_hash: str) -> str:
+    """
+    Content address of a detection's validation, the location, include area and
+    date of the detection and the parameters it was validated with.
+    """
+    return hashlib.sha256(
+        b"|".join(
+            [
+                detection.geom.wkb,
+                detection.area_include_geom.wkb,
+                str(detection.acq_date).encode(),
+                params_hash.encode(),
+            ]
+        )
+    ).hexdigest()
+
+
+class ResultStore:
+    """
+    Validation results stored in a local DuckDB file, so detections validated
+    with the same parameters don't go to Earth Engine again.
+
+    Only results with imagery are stored. Results without imagery (`no_data`,
+    `too_cloudy`) can change when new imagery comes in, so they are validated
+    again.
+    """
+
+    def __init__(self, path: Path | str):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.connection = duckdb.connect(str(path))
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS validation_results (
+                key TEXT PRIMARY KEY,
+                params_hash TEXT,
+                firms_id BIGINT,
+                acq_date DATE,
+                before_date DATE,
+                after_date DATE,
+                burn_scar_detected BOOLEAN,
+                burnt_pixel_count INTEGER,
+                burnt_building_count INTEGER,
+                burnt_area TEXT,
+                no_data BOOLEAN,
+                too_cloudy BOOLEAN,
+                created_at TIMESTAMP DEFAULT current_timestamp
+            )
+            """
+        )
+
+    def get(
+        self, detection: FireDetection, validation_params: dict
+    ) -> ValidationResult | None:
+        key = detection_key(detection, hash_params(validation_params))
+
+        with self._lock:
+            row = self.connection.execute(
+                f"SELECT {', '.join(RESULT_FIELDS)} FROM validation_results WHERE key = ?",
+                [key],
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        result = ValidationResult(**dict(zip(RESULT_FIELDS, row)))
+
+        # FIRMS IDs are stable, but the key is the location and date, which
+        # detections of another satellite or overpass on that day can share
+        result.firms_id = detection.firms_id
+        return result
+
+    def put(
+        self,
+        detection: FireDetection,
+        validation_params: dict,
+        result: ValidationResult | ValidationSummary,
+    ):
+        if result.before_date is None or result.after_date is None:
+            return
+
+        params_hash = hash_params(validation_params)
+        key = detection_key(detection, params_hash)
+
+        with self._lock:
+            self.connection.execute(
+                f"""
+                INSERT OR REPLACE INTO validation_results
+                (key, params_hash, {", ".join(RESULT_FIELDS)})
+                VALUES (?, ?, {", ".join("?" for _ in RESULT_FIELDS)})
+                """,
+                [key, params_hash, *(getattr(result, f) for f in RESULT_FIELDS)],
+            )
+
+    def prune(self, validation_params: dict) -> int:
+        """Remove results validated with other parameters than these."""
+        with self._lock:
+            deleted = self.connection.execute(
+                "DELETE FROM validation_results WHERE params_hash != ?",
+                [hash_params(validation_params)],
+            ).fetchone()
+
+        count = deleted[0] if deleted else 0
+        if count:
+            logger.info(f"Removed {count} stored results with outdated parameters")
+
+        return count
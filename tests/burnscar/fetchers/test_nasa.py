@@ -0,0 +1,172 @@
+import datetime
+import random
+import time
+
+import httpx
+import pandas as pd
+import pytest
+
+from burnscar.fetchers.cache import ResponseCache
+from burnscar.fetchers.nasa import (
+    NASAFetcher,
+    NASARecord,
+    RateLimits,
+    get_day_ranges,
+)
+
+HEADER = "latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_ti5,frp,daynight"
+
+
+def test_fetch_many_keeps_order(monkeypatch):
+    fetcher = NASAFetcher(api_key="test")
+    satellite_codes = {"SNPP": "N", "NOAA20": "N20", "NOAA21": "N21"}
+
+    requests = []
+
+    def fetch_raw(box, date, satellite, day_range):
+        requests.append((date, satellite, day_range))
+        time.sleep(random.uniform(0, 0.01))
+        rows = [
+            f"15.0,30.0,330.0,0.4,0.4,{date + datetime.timedelta(days=i)},1234,"
+            f"{satellite_codes[satellite]},VIIRS,n,2.0NRT,290.0,5.0,D"
+            for i in reversed(range(day_range))
+        ]
+        return "\n".join([HEADER, *rows])
+
+    monkeypatch.setattr(fetcher, "_fetch_raw", fetch_raw)
+
+    dates = [datetime.date(2025, 5, 1) + datetime.timedelta(days=i) for i in range(5)]
+    records = fetcher.fetch_many({}, dates, max_workers=8, max_day_range=3)
+
+    assert len(requests) == 2 * len(fetcher.satellites)
+
+    assert [(r.acq_date, r.satellite.name) for r in records] == [
+        (date, satellite) for date in dates for satellite in fetcher.satellites
+    ]
+    assert records[0].acq_time == datetime.time(12, 34)
+
+
+def test_parse_df_matches_parse():
+    data = "\n".join(
+        [
+            HEADER,
+            "15.0,30.0,330.0,0.4,0.4,2025-05-01,34,N,VIIRS,n,2.0NRT,290.0,5.0,D",
+            "15.5,30.5,340.0,0.5,0.5,2025-05-02,1234,N20,VIIRS,h,2.0NRT,295.0,6.5,N",
+        ]
+    )
+
+    fetcher = NASAFetcher(api_key="test")
+    df = fetcher.parse_df(data)
+    expected = fetcher.to_dataframe(fetcher.parse(data))
+
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+    assert df["acq_time"].tolist() == [datetime.time(0, 34), datetime.time(12, 34)]
+
+
+def test_parse_df_without_rows():
+    df = NASAFetcher(api_key="test").parse_df(HEADER)
+
+    assert df.empty
+    assert list(df.columns) == list(NASARecord.model_fields)
+
+
+def test_parse_df_rejects_unknown_values():
+    data = "\n".join(
+        [HEADER, "15.0,30.0,330.0,0.4,0.4,2025-05-01,34,X,VIIRS,n,2.0NRT,290.0,5.0,D"]
+    )
+
+    with pytest.raises(ValueError, match="satellite"):
+        NASAFetcher(api_key="test").parse_df(data)
+
+
+def test_fetch_many_uses_cache(monkeypatch, tmp_path):
+    requests = []
+
+    def fetch_raw(box, date, satellite, day_range):
+        requests.append((date, satellite, day_range))
+        rows = [
+            f"15.0,30.0,330.0,0.4,0.4,{date + datetime.timedelta(days=i)},1234,"
+            f"N,VIIRS,n,2.0NRT,290.0,5.0,D"
+            for i in range(day_range)
+        ]
+        return "\n".join([HEADER, *rows])
+
+    dates = [datetime.date(2025, 5, 1) + datetime.timedelta(days=i) for i in range(3)]
+
+    fetcher = NASAFetcher(api_key="test", cache=ResponseCache(tmp_path))
+    monkeypatch.setattr(fetcher, "_fetch_raw", fetch_raw)
+    df = fetcher.fetch_many_df({"min_x": 0}, dates[:2], satellites=["SNPP"])
+    assert requests == [(dates[0], "SNPP", 2)]
+
+    # only the date that wasn't cached yet is fetched
+    df = fetcher.fetch_many_df({"min_x": 0}, dates, satellites=["SNPP"])
+    assert requests[1:] == [(dates[2], "SNPP", 1)]
+    assert df["acq_date"].tolist() == dates
+
+    offline = NASAFetcher(api_key="", cache=ResponseCache(tmp_path, offline=True))
+    pd.testing.assert_frame_equal(
+        offline.fetch_many_df({"min_x": 0}, dates, satellites=["SNPP"]), df
+    )
+    with pytest.raises(LookupError):
+        offline.fetch_many_df({"min_x": 1}, dates, satellites=["SNPP"])
+
+
+def test_response_cache_expires_near_real_time(tmp_path):
+    cache = ResponseCache(tmp_path, ttl=0)
+    today = datetime.date.today()
+
+    cache.put("SNPP", "NRT", {}, today, HEADER)
+    cache.put("SNPP", "SP", {}, today, HEADER)
+    cache.put("SNPP", "NRT", {}, today - datetime.timedelta(days=3), HEADER)
+    time.sleep(0.01)
+
+    assert cache.get("SNPP", "NRT", {}, today) is None
+    assert cache.get("SNPP", "SP", {}, today) == HEADER
+    assert cache.get("SNPP", "NRT", {}, today - datetime.timedelta(days=3)) == HEADER
+
+
+def test_get_day_ranges():
+    d = datetime.date(2025, 5, 1)
+    dates = [d + datetime.timedelta(days=i) for i in [0, 1, 2, 3, 5, 6]]
+
+    assert get_day_ranges(dates, max_day_range=3) == [
+        (d, 3),
+        (d + datetime.timedelta(days=3), 1),
+        (d + datetime.timedelta(days=5), 2),
+    ]
+
+
+class FakeStatusClient:
+    def __init__(self, current_transactions: int = 0):
+        self.current_transactions = current_transactions
+        self.calls = 0
+
+    def get(self, url):
+        self.calls += 1
+        return httpx.Response(
+            200,
+            json={
+                "transaction_limit": 40,
+                "current_transactions": self.current_transactions,
+                "transaction_interval": "0.05 seconds",
+            },
+        )
+
+
+def test_rate_limits_only_sync_when_needed():
+    client = FakeStatusClient()
+    rate_limits = RateLimits(client=client, api_key="test", margin=30)
+
+    for _ in range(10):
+        rate_limits.acquire()
+    assert client.calls == 1
+    assert rate_limits.remaining == 30
+
+    # out of budget, wait for the window to pass
+    rate_limits.acquire()
+    assert client.calls > 1
+
+    rate_limits.on_limit_exceeded()
+    calls = client.calls
+    rate_limits.acquire()
+    assert client.calls == calls + 1
@@ -0,0 +1,36 @@
+import json
+
+from shapely import box, to_geojson
+
+from burnscar.fetchers import open_buildings
+
+
+def test_ensure_open_buildings_selects_intersecting_tiles(tmp_path, monkeypatch):
+    tiles = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": json.loads(to_geojson(box(*bounds))),
+                "properties": {"tile_id": tile_id},
+            }
+            for tile_id, bounds in [("a", (0, 0, 1, 1)), ("b", (5, 5, 6, 6))]
+        ],
+    }
+    (tmp_path / "tiles.geojson").write_text(json.dumps(tiles))
+
+    fetched = []
+
+    def fetch_tile(tile_id, full_path):
+        fetched.append(tile_id)
+        full_path.write_text("latitude,longitude")
+
+    monkeypatch.setattr(open_buildings, "fetch_tile", fetch_tile)
+
+    area = dict(min_x=0.5, min_y=0.5, max_x=2, max_y=2)
+    paths = open_buildings.ensure_open_buildings(tmp_path, area)
+    assert paths == [tmp_path / "a_buildings.csv.gz"]
+
+    # tiles that were downloaded before are reused
+    assert open_buildings.ensure_open_buildings(tmp_path, area) == paths
+    assert fetched == ["a"]
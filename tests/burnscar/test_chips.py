@@ -0,0 +1,162 @@
+import datetime
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pytest
+from shapely import Point, box
+
+from burnscar import chips
+from burnscar.chips import ChipExporter, ChipFormat, ChipRequest, to_chip
+from burnscar.validators.gee import GEEValidator
+from burnscar.validators.local import ChipStore
+from burnscar.validators.retry import RetryPolicy
+
+
+class FakeImage:
+    def __init__(self, name: str):
+        self.name = name
+
+    def selfMask(self) -> "FakeImage":
+        return self
+
+
+@pytest.fixture
+def exporter(tmp_path, monkeypatch) -> ChipExporter:
+    # Earth Engine expressions are replaced by named fakes, urls by their name
+    monkeypatch.setattr(chips, "initialize", lambda key_path: None)
+    monkeypatch.setattr(
+        GEEValidator, "_get_ee_aoi_bounds", staticmethod(lambda d, b: "aoi")
+    )
+    monkeypatch.setattr(
+        GEEValidator,
+        "_get_selected_images",
+        classmethod(
+            lambda cls, area, bounds, selection, max_cloudy: (
+                FakeImage(f"before_{selection.before_date}"),
+                FakeImage(f"after_{selection.after_date}"),
+            )
+        ),
+    )
+    monkeypatch.setattr(
+        GEEValidator, "_get_nbr_difference", staticmethod(lambda b, a: None)
+    )
+    monkeypatch.setattr(
+        GEEValidator, "_get_nbr_mask", staticmethod(lambda *args: FakeImage("burnt"))
+    )
+
+    exporter = ChipExporter(
+        key_path=tmp_path / "key.json",
+        path=tmp_path / "chips",
+        file_format=ChipFormat.geotiff,
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+    exporter.downloads = []  # type: ignore[attr-defined]
+
+    def download(url: str) -> bytes:
+        if url == "fail":
+            raise httpx.ConnectError("connection refused")
+        exporter.downloads.append(url)  # type: ignore[attr-defined]
+        return url.encode()
+
+    monkeypatch.setattr(
+        exporter, "_get_url", lambda image, visualization, region: image.name
+    )
+    monkeypatch.setattr(exporter, "_download", download)
+    return exporter
+
+
+def make_request(firms_id: int) -> ChipRequest:
+    # as read by `burnscar chips`, with WKB geometries
+    return ChipRequest.model_validate(
+        dict(
+            firms_id=firms_id,
+            acq_date=datetime.date(2025, 5, 1),
+            geom=Point(30.0, 15.0).wkb,
+            area_include_geom=box(29, 14, 31, 16).wkb,
+            area_include_id="a",
+            before_date=datetime.date(2025, 4, 28),
+            after_date=datetime.date(2025, 5, 3),
+        )
+    )
+
+
+def test_chip_exporter(exporter, tmp_path):
+    paths = exporter.export(make_request(1))
+
+    assert [path.relative_to(tmp_path / "chips") for path in paths] == [
+        Path("1_2025-05-01/before_2025-04-28.tif"),
+        Path("1_2025-05-01/after_2025-05-03.tif"),
+        Path("1_2025-05-01/burnt_area_2025-04-28_2025-05-03.tif"),
+    ]
+    assert paths[0].read_bytes() == b"before_2025-04-28"
+
+    # exported chips are skipped
+    assert exporter.export(make_request(1)) == paths
+    assert len(exporter.downloads) == 3
+
+
+def test_chip_exporter_continues_after_failure(exporter, monkeypatch):
+    get_url = exporter._get_url
+    monkeypatch.setattr(
+        exporter,
+        "_get_url",
+        lambda image, visualization, region: (
+            "fail" if image.name == "burnt" else get_url(image, visualization, region)
+        ),
+    )
+
+    # the chip that fails to download is left out
+    exported = list(exporter.export_many([make_request(1)], max_workers=1))
+    assert exported == [[]]
+    assert len(exporter.downloads) == 2
+
+
+def test_chip_exporter_continues_after_any_error(exporter, monkeypatch):
+    export = exporter.export
+
+    def fail_first(request: ChipRequest) -> list[Path]:
+        if request.firms_id == 1:
+            raise ValueError("not a GeoTIFF")
+        return export(request)
+
+    monkeypatch.setattr(exporter, "export", fail_first)
+
+    exported = list(
+        exporter.export_many([make_request(1), make_request(2)], max_workers=1)
+    )
+    assert sorted(len(paths) for paths in exported) == [0, 3]
+
+
+def test_to_chip(tmp_path):
+    # bands of two images stacked with `toBands()`, and a buildings raster
+    names = [
+        "20250420T083601_B8",
+        "20250420T083601_B12",
+        "20250505T083559_B8",
+        "20250505T083559_B12",
+        "buildings",
+    ]
+    pixels = np.zeros((4, 4), dtype=[(name, np.int64) for name in names])
+    pixels["20250505T083559_B8"] = 1000
+    pixels["buildings"][1, 1] = 7
+
+    image_metadata = [[1745138161000, 5.0], [1746433559000, 12.5]]
+    chip = to_chip(pixels, image_metadata)
+
+    assert chip.dates == [datetime.date(2025, 4, 20), datetime.date(2025, 5, 5)]
+    assert chip.cloudy_pixel_percentage == [5.0, 12.5]
+    assert chip.b8.shape == chip.b12.shape == (2, 4, 4)
+    assert chip.b8[1].max() == 1000
+    assert chip.b12.max() == 0
+
+    # round trips through the layout the local validator reads
+    chip_store = ChipStore(tmp_path)
+    chip_store.save(1, datetime.date(2025, 5, 1), chip)
+    assert chip_store.exists(1, datetime.date(2025, 5, 1))
+
+    loaded = chip_store.load(1, datetime.date(2025, 5, 1))
+    assert loaded is not None
+    assert loaded.dates == chip.dates
+    assert loaded.buildings is not None
+    assert loaded.buildings[1, 1] == 7
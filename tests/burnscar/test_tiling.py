@@ -0,0 +1,21 @@
+from shapely import Polygon, box, union_all
+
+from burnscar.tiling import plan_tiles
+
+
+def test_plan_tiles_follows_geometry():
+    # an L shape, with the top right of its extent empty
+    geometry = Polygon([(0, 0), (3, 0), (3, 1), (1, 1), (1, 3), (0, 3)])
+
+    tiles = plan_tiles(geometry, tile_size=1.0, merge=False)
+    assert len(tiles) == 5
+
+    merged = plan_tiles(geometry, tile_size=1.0)
+    assert merged == [
+        {"min_x": 0.0, "min_y": 0.0, "max_x": 3.0, "max_y": 1.0},
+        {"min_x": 0.0, "min_y": 1.0, "max_x": 1.0, "max_y": 2.0},
+        {"min_x": 0.0, "min_y": 2.0, "max_x": 1.0, "max_y": 3.0},
+    ]
+
+    covered = union_all([box(*tile.values()) for tile in merged])
+    assert covered.contains(geometry)
@@ -0,0 +1,35 @@
+import threading
+import time
+
+from burnscar.utils import map_bounded
+
+
+def test_map_bounded_limits_items_in_flight():
+    consumed = 0
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def items():
+        nonlocal consumed
+        for i in range(100):
+            consumed += 1
+            yield i
+
+    def square(i: int) -> int:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.001)
+        with lock:
+            in_flight -= 1
+        return i * i
+
+    results = map_bounded(square, items(), max_workers=4, window=8)
+    first = next(results)
+
+    assert first in {i * i for i in range(8)}
+    assert consumed <= 16
+    assert sorted([first, *results]) == [i * i for i in range(100)]
+    assert max_in_flight <= 4
@@ -0,0 +1,164 @@
+import datetime
+import typing as t
+
+import pytest
+from shapely import Point, box
+
+from burnscar.models import FireDetection
+from burnscar.validators import gee
+from burnscar.validators.gee import GEEValidator
+
+ACQ_DATE = datetime.date(2025, 5, 1)
+
+BURNT = {
+    "before_date": "2025-04-28",
+    "after_date": "2025-05-03",
+    "burnt_pixel_count": 42,
+    "burnt_building_count": 3,
+}
+
+FAILING_FIRMS_ID = 99
+
+
+class FakeCollection:
+    """Stands in for the FeatureCollection of a batch, without Earth Engine."""
+
+    def __init__(self, features: list[tuple[int, FireDetection]]):
+        self.features = features
+
+    def map(self, func: t.Callable) -> "FakeCollection":
+        return self
+
+
+def make_detection(firms_id: int, image_metadata=None) -> FireDetection:
+    return FireDetection(
+        firms_id=firms_id,
+        acq_date=ACQ_DATE,
+        geom=Point(30.0, 15.0).wkb,
+        area_include_geom=box(29, 14, 31, 16).wkb,
+        image_metadata=image_metadata,
+    )
+
+
+@pytest.fixture
+def validator(monkeypatch) -> GEEValidator:
+    # batches are answered with the properties `_validate_feature` returns,
+    # per FIRMS ID: an analysis, `no_data` or `too_cloudy`
+    properties = {
+        1: BURNT,
+        2: {"no_data": True},
+        3: {"too_cloudy": True},
+        4: {**BURNT, "burnt_pixel_count": 5},
+    }
+
+    monkeypatch.setattr(gee, "initialize", lambda key_path: None)
+    monkeypatch.setattr(gee, "FeatureCollection", FakeCollection)
+    monkeypatch.setattr(
+        GEEValidator,
+        "_get_ee_detection",
+        staticmethod(lambda index, detection: (index, detection)),
+    )
+
+    validator = GEEValidator(key_path="key.json")
+    validator.requests = []  # type: ignore[attr-defined]
+
+    def get_info(obj: FakeCollection, stage: str) -> dict:
+        firms_ids = [detection.firms_id for _, detection in obj.features]
+        validator.requests.append(firms_ids)  # type: ignore[attr-defined]
+        if FAILING_FIRMS_ID in firms_ids:
+            raise RuntimeError("User memory limit exceeded")
+
+        # features the server drops are missing from the response
+        return {
+            "features": [
+                {"properties": {**properties[detection.firms_id], "index": index}}
+                for index, detection in obj.features
+                if detection.firms_id in properties
+            ]
+        }
+
+    monkeypatch.setattr(validator, "_get_info", get_info)
+    return validator
+
+
+def test_validate_batch(validator):
+    results = validator.validate_batch(
+        [make_detection(firms_id) for firms_id in (1, 2, 3, 4, 5)]
+    )
+
+    burnt, no_data, too_cloudy, unburnt, missing = results
+    assert [r.firms_id for r in results] == [1, 2, 3, 4, 5]
+
+    assert burnt.burn_scar_detected
+    assert burnt.before_date == datetime.date(2025, 4, 28)
+    assert burnt.after_date == datetime.date(2025, 5, 3)
+    assert burnt.burnt_pixel_count == 42
+    assert burnt.burnt_building_count == 3
+
+    assert no_data.no_data and not no_data.too_cloudy
+    assert no_data.before_date is None
+
+    assert too_cloudy.too_cloudy and not too_cloudy.no_data
+    assert not too_cloudy.burn_scar_detected
+
+    assert not unburnt.burn_scar_detected
+    assert unburnt.burnt_pixel_count == 5
+
+    assert missing.no_data
+
+
+def test_validate_batch_resolves_catalog_detections_locally(validator):
+    # only a scene after the detection, so there is nothing to compare with
+    after_only = [(datetime.date(2025, 5, 3), 5.0)]
+    results = validator.validate_batch(
+        [make_detection(2, after_only), make_detection(1)]
+    )
+
+    assert [r.firms_id for r in results] == [2, 1]
+    assert results[0].no_data
+    assert results[1].burn_scar_detected
+    assert validator.requests == [[1]]
+
+    # no request at all when every detection is resolved
+    validator.validate_batch([make_detection(2, after_only)])
+    assert validator.requests == [[1]]
+
+
+def test_parse_batch_result_burnt_area():
+    result = GEEValidator._parse_batch_result(
+        make_detection(1),
+        {
+            **BURNT,
+            "burnt_building_count": None,
+            "burnt_area": {
+                "type": "Polygon",
+                "coordinates": [[[30, 15], [30.01, 15], [30.01, 15.01], [30, 15]]],
+            },
+        },
+        burnt_pixel_count_threshold=10,
+    )
+
+    assert result.burnt_building_count == 0
+    assert result.burnt_area is not None
+    assert result.burnt_area.startswith("POLYGON")
+
+
+def test_validate_many_batched(validator):
+    detections = [
+        make_detection(firms_id) for firms_id in (1, 2, 3, FAILING_FIRMS_ID, 4)
+    ]
+    results = list(
+        validator.validate_many(
+            detections, validation_params={}, max_workers=1, batch_size=2
+        )
+    )
+
+    assert validator.requests == [[1, 2], [3, FAILING_FIRMS_ID], [4]]
+    by_firms_id = {r.firms_id: r for r in results}
+    assert len(by_firms_id) == 5
+
+    # a failed batch only loses its own detections
+    assert by_firms_id[1].burn_scar_detected
+    assert by_firms_id[3].no_data
+    assert by_firms_id[FAILING_FIRMS_ID].no_data
+    assert not by_firms_id[4].no_data
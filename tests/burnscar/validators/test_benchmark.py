@@ -0,0 +1,28 @@
+import datetime
+
+import pandas as pd
+from shapely import Point, box
+
+from burnscar.validators.benchmark import read_detections
+
+
+def test_read_detections(tmp_path):
+    # as exported with ST_ASHEXWKB, include area ids that look like numbers
+    path = tmp_path / "input.csv"
+    pd.DataFrame(
+        {
+            "firms_id": [1, 2],
+            "acq_date": ["2025-05-01", "2025-05-02"],
+            "geom": [Point(30.0, 15.0).wkb_hex, Point(30.5, 15.0).wkb_hex],
+            "area_include_geom": [box(29, 14, 31, 16).wkb_hex] * 2,
+            "area_include_id": ["7", None],
+        }
+    ).to_csv(path, index=False)
+
+    first, second = read_detections(path)
+
+    assert first.acq_date == datetime.date(2025, 5, 1)
+    assert first.geom.equals(Point(30.0, 15.0))
+    assert first.area_include_geom.equals(box(29, 14, 31, 16))
+    assert first.area_include_id == "7"
+    assert second.area_include_id is None
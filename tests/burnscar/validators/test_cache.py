@@ -0,0 +1,57 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from burnscar.validators.cache import RequestCache
+
+
+def test_lru_eviction():
+    cache = RequestCache(max_size=2, ttl=None)
+
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: -1)  # a is now most recently used
+    cache.get_or_compute("c", lambda: 3)
+
+    assert cache.get_or_compute("a", lambda: -1) == 1
+    assert cache.get_or_compute("b", lambda: -2) == -2
+
+
+def test_ttl_expiry():
+    cache = RequestCache(ttl=0.01)
+
+    cache.get_or_compute("a", lambda: 1)
+    time.sleep(0.02)
+
+    assert cache.get_or_compute("a", lambda: 2) == 2
+
+
+def test_disk_tier(tmp_path):
+    RequestCache(path=tmp_path).get_or_compute("a", lambda: {"value": [1, 2]})
+
+    assert RequestCache(path=tmp_path).get_or_compute("a", lambda: None) == {
+        "value": [1, 2]
+    }
+
+
+def test_concurrent_requests_are_coalesced():
+    cache = RequestCache()
+    calls = 0
+    release = threading.Event()
+
+    def compute():
+        nonlocal calls
+        calls += 1
+        release.wait(timeout=5)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        futures = [
+            executor.submit(cache.get_or_compute, "a", compute) for _ in range(10)
+        ]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == [42] * 10
+    assert calls == 1
@@ -0,0 +1,145 @@
+import datetime
+import threading
+import time
+
+from shapely import Point, box
+
+from burnscar.models import FireDetection
+from burnscar.validators.engine import AIMDLimiter, AsyncValidator
+from burnscar.validators.gee import ValidationResult, ValidationSummary
+from burnscar.validators.retry import RetryPolicy
+
+
+class CountingValidator:
+    def __init__(self):
+        self.validated = 0
+        self._lock = threading.Lock()
+
+    def validate(self, detection: FireDetection, **kwargs) -> ValidationResult:
+        with self._lock:
+            self.validated += 1
+        return ValidationResult(
+            firms_id=detection.firms_id, acq_date=detection.acq_date
+        )
+
+
+def make_detections(count: int) -> list[FireDetection]:
+    return [
+        FireDetection(
+            firms_id=firms_id,
+            acq_date=datetime.date(2025, 5, 1),
+            geom=Point(30.0, 15.0).wkb,
+            area_include_geom=box(29, 14, 31, 16).wkb,
+        )
+        for firms_id in range(count)
+    ]
+
+
+def test_limiter_increases_by_one_per_round():
+    limiter = AIMDLimiter(initial=4, maximum=50)
+
+    for _ in range(4):
+        limiter.on_success()
+
+    assert limiter.limit == 4
+    for _ in range(2):
+        limiter.on_success()
+
+    assert limiter.limit == 5
+
+
+def test_limiter_decreases_once_per_round():
+    limiter = AIMDLimiter(initial=20, maximum=50)
+
+    limiter.on_overload()
+    limiter.on_overload()  # same round, ignored
+    assert limiter.limit == 10
+
+    for _ in range(10):
+        limiter.on_overload()
+    assert limiter.limit == 5
+
+
+def test_limiter_bounds():
+    limiter = AIMDLimiter(initial=2, minimum=2, maximum=3)
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 3
+
+    for _ in range(100):
+        limiter.on_overload()
+    assert limiter.limit == 2
+
+
+def test_limiter_decreases_on_latency():
+    limiter = AIMDLimiter(initial=2, maximum=50, latency_smoothing=1.0)
+
+    for _ in range(10):
+        limiter.on_success(latency=1.0)
+    limit = limiter.limit
+
+    limiter.on_success(latency=5.0)
+    assert limiter.limit < limit
+
+
+def test_async_validator_does_not_run_ahead():
+    validator = CountingValidator()
+    async_validator = AsyncValidator(
+        validator, {}, limiter=AIMDLimiter(initial=2, maximum=2)
+    )
+
+    results = async_validator.validate_many(
+        make_detections(100), lean=True, max_buffered=2
+    )
+    assert isinstance(next(results), ValidationSummary)
+
+    # the queue is full, so validation waits for the consumer
+    time.sleep(0.5)
+    assert validator.validated <= 6
+
+    # and stops when the consumer is gone
+    results.close()
+    validated = validator.validated
+    time.sleep(0.2)
+    assert validator.validated == validated
+
+
+def test_async_validator_validates_all():
+    async_validator = AsyncValidator(CountingValidator(), {})
+
+    results = list(async_validator.validate_many(make_detections(20), max_buffered=1))
+    assert sorted(r.firms_id for r in results) == list(range(20))
+    assert all(isinstance(r, ValidationResult) for r in results)
+
+
+class QuotaRetryingValidator(CountingValidator):
+    """Hits a quota error on the first request, which its own retries absorb."""
+
+    def __init__(self):
+        super().__init__()
+        self.retry_policy = RetryPolicy(max_attempts=2, base_delay=0.0)
+        self.failed = False
+
+    def validate(self, detection: FireDetection, **kwargs) -> ValidationResult:
+        def request():
+            with self._lock:
+                if not self.failed:
+                    self.failed = True
+                    raise RuntimeError("Too many concurrent aggregations")
+
+        self.retry_policy.call(request)
+        return super().validate(detection, **kwargs)
+
+
+def test_async_validator_decreases_on_retried_quota_errors():
+    validator = QuotaRetryingValidator()
+    limiter = AIMDLimiter(initial=8, maximum=8)
+    engine = AsyncValidator(validator, validation_params={}, limiter=limiter)
+
+    results = list(engine.validate_many(make_detections(1)))
+
+    # the detection succeeded, but the limiter saw the quota error
+    assert len(results) == 1 and not results[0].no_data
+    assert limiter.limit < 8
+    assert validator.retry_policy.on_error is None
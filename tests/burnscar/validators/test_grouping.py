@@ -0,0 +1,42 @@
+import datetime
+
+from shapely import Point, box
+
+from burnscar.models import FireDetection
+from burnscar.validators.grouping import get_aoi_bounds, group_overlapping
+
+
+def test_get_aoi_bounds():
+    detection = FireDetection(
+        firms_id=1,
+        acq_date=datetime.date(2025, 5, 1),
+        geom=Point(30.0, 60.0).wkb,
+        area_include_geom=box(29, 59, 31, 61).wkb,
+    )
+
+    aoi = get_aoi_bounds(detection, buffer_distance=1000)
+    min_x, min_y, max_x, max_y = aoi.bounds
+
+    # a degree of longitude is half as long at 60 degrees latitude
+    assert round((max_x - min_x) / (max_y - min_y), 3) == 2.0
+
+
+def test_group_overlapping():
+    polygons = [
+        box(0, 0, 1, 1),
+        box(5, 5, 6, 6),
+        box(0.5, 0.5, 1.5, 1.5),
+        box(1.4, 1.4, 2, 2),  # only overlaps through the previous box
+        box(10, 10, 11, 11),
+    ]
+
+    assert group_overlapping(polygons) == [[0, 2, 3], [1], [4]]
+
+
+def test_group_overlapping_splits_large_groups():
+    # a chain of overlapping boxes along the x axis
+    polygons = [box(i, 0, i + 1.5, 1) for i in range(8)]
+
+    assert group_overlapping(polygons) == [list(range(8))]
+    assert group_overlapping(polygons, max_size=3) == [[0, 1], [2, 3], [4, 5], [6, 7]]
+    assert group_overlapping(polygons, max_extent=5) == [[0, 1, 2, 3], [4, 5, 6, 7]]
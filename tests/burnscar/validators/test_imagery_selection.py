@@ -0,0 +1,76 @@
+import datetime
+import time
+import types
+
+import pytest
+
+from burnscar.utils import date_from_millis
+from burnscar.validators import gee
+from burnscar.validators.gee import GEEValidator, ImagerySelection
+
+TARGET = datetime.date(2025, 5, 15)
+
+
+def day(offset: int) -> datetime.date:
+    return TARGET + datetime.timedelta(days=offset)
+
+
+@pytest.mark.parametrize(
+    "image_metadata, expected",
+    [
+        ([], ImagerySelection(no_data=True)),
+        ([(day(-5), 0.0), (day(-1), 0.0)], ImagerySelection(no_data=True)),
+        ([(day(-5), 0.0), (day(0), 0.0)], ImagerySelection(no_data=True)),
+        ([(day(-5), 50.0), (day(5), 0.0)], ImagerySelection(too_cloudy=True)),
+        ([(day(-5), 10.0), (day(5), 0.0)], ImagerySelection(too_cloudy=True)),
+        (
+            [(day(-10), 0.0), (day(-5), 50.0), (day(0), 0.0), (day(3), 0.0)],
+            ImagerySelection(before_date=day(-10), after_date=day(3)),
+        ),
+        (
+            [(day(-2), 5.0), (day(-2), 80.0), (day(7), 5.0), (day(4), 20.0)],
+            ImagerySelection(before_date=day(-2), after_date=day(7)),
+        ),
+    ],
+)
+def test_select_imagery(image_metadata, expected):
+    selection = GEEValidator._select_imagery(
+        image_metadata, TARGET, max_cloudy_percentage=10
+    )
+
+    assert selection == expected
+
+
+@pytest.fixture
+def pacific_time(monkeypatch):
+    # a time zone where local dates of afternoon overpasses differ from UTC
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+class FakeCollection:
+    def reduceColumns(self, reducer, selectors) -> "FakeCollection":
+        return self
+
+    def get(self, key: str) -> "FakeCollection":
+        return self
+
+
+def test_image_metadata_uses_utc_dates(pacific_time, monkeypatch):
+    # 2025-05-15 02:30 UTC, still the 14th in local time
+    ts = datetime.datetime(2025, 5, 15, 2, 30, tzinfo=datetime.UTC).timestamp() * 1000
+    assert datetime.date.fromtimestamp(ts / 1000) == datetime.date(2025, 5, 14)
+
+    monkeypatch.setattr(gee, "initialize", lambda key_path: None)
+    monkeypatch.setattr(gee, "Reducer", types.SimpleNamespace(toList=lambda n: None))
+    validator = GEEValidator(key_path="key.json")
+    monkeypatch.setattr(validator, "_get_info", lambda obj, stage: [[ts, 5.0]])
+
+    # the day Earth Engine filters on, and floors to in batch validation
+    assert validator._get_image_metadata(image_collection=FakeCollection()) == [
+        (datetime.date(2025, 5, 15), 5.0)
+    ]
+    assert date_from_millis(ts) == datetime.date(2025, 5, 15)
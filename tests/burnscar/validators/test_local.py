@@ -0,0 +1,94 @@
+import datetime
+
+import numpy as np
+from shapely import Point, box
+
+from burnscar.models import FireDetection
+from burnscar.validators.local import Chip, ChipStore, LocalValidator
+
+ACQ_DATE = datetime.date(2025, 5, 1)
+
+
+def make_detection(firms_id: int) -> FireDetection:
+    return FireDetection(
+        firms_id=firms_id,
+        acq_date=ACQ_DATE,
+        geom=Point(30.0, 15.0).wkb,
+        area_include_geom=box(29, 14, 31, 16).wkb,
+    )
+
+
+def make_chip(burnt: bool, after_cloudy_percentage: float = 5.0) -> Chip:
+    # vegetation everywhere before, a burnt square in the center after
+    b8 = np.full((2, 300, 300), 3000, dtype=np.uint16)
+    b12 = np.full((2, 300, 300), 1000, dtype=np.uint16)
+    if burnt:
+        b8[1, 140:160, 140:160] = 1000
+        b12[1, 140:160, 140:160] = 3000
+
+    buildings = np.zeros((300, 300), dtype=np.int32)
+    buildings[145:147, 145:147] = 1  # burnt
+    buildings[10:12, 10:12] = 2  # outside the buffer
+
+    return Chip(
+        dates=[datetime.date(2025, 4, 20), datetime.date(2025, 5, 5)],
+        cloudy_pixel_percentage=[5.0, after_cloudy_percentage],
+        b8=b8,
+        b12=b12,
+        buildings=buildings,
+    )
+
+
+def test_local_validator(tmp_path):
+    chip_store = ChipStore(tmp_path)
+    chip_store.save(1, ACQ_DATE, make_chip(burnt=True))
+    chip_store.save(2, ACQ_DATE, make_chip(burnt=False))
+    chip_store.save(3, ACQ_DATE, make_chip(burnt=True, after_cloudy_percentage=80))
+
+    validator = LocalValidator(chip_store)
+    burnt, unburnt, cloudy, missing = sorted(
+        validator.validate_many(
+            [make_detection(i) for i in range(1, 5)],
+            validation_params={"buffer_distance": 1000},
+            batch_size=2,
+        ),
+        key=lambda result: result.firms_id,
+    )
+
+    assert burnt.burn_scar_detected
+    assert burnt.burnt_pixel_count == 400
+    assert burnt.burnt_building_count == 1
+    assert burnt.before_date == datetime.date(2025, 4, 20)
+    assert burnt.after_date == datetime.date(2025, 5, 5)
+
+    assert not unburnt.burn_scar_detected
+    assert unburnt.burnt_pixel_count == 0
+
+    assert cloudy.too_cloudy and cloudy.before_date is None
+    assert missing.no_data
+
+
+def test_local_validator_corrupt_chip(tmp_path):
+    chip_store = ChipStore(tmp_path)
+    chip_store.save(1, ACQ_DATE, make_chip(burnt=True))
+    chip_store.save(2, ACQ_DATE, make_chip(burnt=True))
+
+    # a truncated download
+    path = tmp_path / f"3_{ACQ_DATE}.npz"
+    path.write_bytes((tmp_path / f"1_{ACQ_DATE}.npz").read_bytes()[:100])
+
+    validator = LocalValidator(chip_store)
+    results = sorted(
+        validator.validate_many(
+            [make_detection(i) for i in range(1, 4)],
+            validation_params={"buffer_distance": 1000},
+            batch_size=2,
+        ),
+        key=lambda result: result.firms_id,
+    )
+
+    # only the batch with the corrupt chip is lost
+    assert [r.firms_id for r in results] == [1, 2, 3]
+    assert results[0].burn_scar_detected
+    assert results[1].burn_scar_detected
+    assert results[2].no_data
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+from burnscar.validators.metrics import ValidationMetrics, write_metrics
+from burnscar.validators.retry import RetryPolicy
+
+
+def test_stage_metrics():
+    metrics = ValidationMetrics()
+    retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+    attempts = iter([TimeoutError("timed out"), 42])
+
+    def get_info():
+        result = next(attempts)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with metrics.detections([1, 2]):
+        with metrics.stage("batch"):
+            metrics.on_request()
+            retry_policy.call(get_info, on_error=metrics.on_error)
+
+        with pytest.raises(ValueError):
+            with metrics.stage("burnt_pixel_count"):
+                metrics.on_request()
+                retry_policy.call(
+                    lambda: (_ for _ in ()).throw(ValueError("invalid")),
+                    on_error=metrics.on_error,
+                )
+
+    rows = metrics.drain().set_index(["firms_id", "stage"])
+    assert len(rows) == 6
+    assert rows.loc[(1, "batch"), "retries"] == 1
+    assert rows.loc[(1, "batch"), "error_class"] == "transient"
+    assert rows.loc[(2, "batch"), "detections"] == 2
+    assert rows.loc[(1, "burnt_pixel_count"), "retries"] == 0
+    assert rows.loc[(1, "burnt_pixel_count"), "error_class"] == "permanent"
+    assert metrics.drain().empty
+
+
+def test_total_is_recorded_once(tmp_path):
+    metrics = ValidationMetrics()
+
+    # imagery is selected per detection, then the group is validated
+    for firms_id in (1, 2):
+        with metrics.detections([firms_id], total=False):
+            with metrics.stage("image_metadata"):
+                metrics.on_request()
+
+    with metrics.detections([1, 2]):
+        with metrics.stage("group"):
+            metrics.on_request()
+
+    metrics_df = metrics.drain()
+    assert metrics_df.groupby("stage").size().to_dict() == {
+        "group": 2,
+        "image_metadata": 2,
+        "total": 2,
+    }
+
+    # appended to the same file, with a single header
+    path = tmp_path / "metrics" / "validation_runs.csv"
+    write_metrics(metrics_df, path)
+    write_metrics(metrics_df, path)
+    assert len(pd.read_csv(path)) == 12
@@ -0,0 +1,38 @@
+import json
+from pathlib import Path
+
+import ee
+import pytest
+
+from burnscar.validators import gee
+from burnscar.validators.replay import Replay
+
+
+@pytest.fixture
+def initialized(tmp_path):
+    # the client needs algorithm signatures to build expressions, none are
+    # needed for constants
+    (tmp_path / "algorithms.json").write_text(json.dumps({}))
+    with Replay(tmp_path):
+        gee.initialize(Path("key.json"))
+
+    yield
+    ee.Reset()
+
+
+def test_record_and_replay(tmp_path, monkeypatch, initialized):
+    monkeypatch.setattr(ee.data, "computeValue", lambda obj: {"answer": 42})
+
+    with Replay(tmp_path, mode="record") as replay:
+        assert ee.Number(1).getInfo() == {"answer": 42}
+    assert replay.round_trips == 1
+
+    monkeypatch.setattr(ee.data, "computeValue", lambda obj: pytest.fail("network"))
+
+    with Replay(tmp_path, latency=0.01) as replay:
+        assert ee.Number(1).getInfo() == {"answer": 42}
+        assert replay.round_trips == 1
+        assert replay.latencies[0] >= 0.01
+
+        with pytest.raises(LookupError):
+            ee.Number(2).getInfo()
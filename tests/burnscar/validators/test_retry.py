@@ -0,0 +1,59 @@
+import pytest
+
+from burnscar.validators.retry import ErrorClass, RetryPolicy, classify_error
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (Exception("Too many concurrent aggregations."), ErrorClass.quota),
+        (Exception("<HttpError 429 ... Quota exceeded>"), ErrorClass.quota),
+        (Exception("Internal error."), ErrorClass.transient),
+        (TimeoutError("The read operation timed out"), ErrorClass.transient),
+        (Exception("Image.clip: Parameter 'input' is required."), ErrorClass.permanent),
+        (Exception("Computation timed out."), ErrorClass.permanent),
+    ],
+)
+def test_classify_error(error, expected):
+    assert classify_error(error) == expected
+
+
+def test_retries_until_success():
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    errors = [Exception("Too many concurrent aggregations."), TimeoutError()]
+
+    def func():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert policy.call(func) == "ok"
+    assert policy.counts == {"retried_quota": 1, "retried_transient": 1, "success": 1}
+
+
+def test_permanent_errors_are_not_retried():
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    calls = 0
+
+    def func():
+        nonlocal calls
+        calls += 1
+        raise ValueError("Invalid argument")
+
+    with pytest.raises(ValueError):
+        policy.call(func)
+
+    assert calls == 1
+    assert policy.counts == {"failed_permanent": 1}
+
+
+def test_gives_up_after_max_attempts():
+    policy = RetryPolicy(max_attempts=2, base_delay=0)
+
+    def func():
+        raise Exception("Service unavailable")
+
+    with pytest.raises(Exception, match="Service unavailable"):
+        policy.call(func)
+
+    assert policy.counts == {"retried_transient": 1, "failed_transient": 1}
@@ -0,0 +1,135 @@
+import datetime
+from collections import Counter
+
+import pandas as pd
+from shapely import Point, box
+
+from burnscar.models import FireDetection
+from burnscar.validators.gee import (
+    ValidationResult,
+    ValidationSummary,
+    complete_validation_params,
+)
+from burnscar.validators.sharding import (
+    ChunkResult,
+    ShardedValidator,
+    detection_key,
+    plan_chunks,
+)
+from burnscar.validators.store import ResultStore
+
+FAILING_FIRMS_ID = 99
+
+# the params results are stored with
+PARAMS = complete_validation_params({})
+
+
+def make_detection(firms_id: int, x: float, area: str = "a") -> FireDetection:
+    offset = 0 if area == "a" else 10
+    return FireDetection(
+        firms_id=firms_id,
+        acq_date=datetime.date(2025, 5, 1),
+        geom=Point(x, 15.0).wkb,
+        area_include_geom=box(29 + offset, 14, 31 + offset, 16).wkb,
+        area_include_id=area,
+    )
+
+
+def burnt_pixel_count(detection: FireDetection) -> int:
+    # differs per include area, to check the right detection is stored
+    return detection.firms_id + (10 if detection.area_include_id == "b" else 0)
+
+
+def fake_initialize_worker(key_path, count_buildings, cache, retry):
+    pass
+
+
+def fake_validate_chunk(detections, validation_params, max_workers, batch_size, group):
+    if any(d.firms_id == FAILING_FIRMS_ID for d in detections):
+        raise RuntimeError("Earth Engine is down")
+
+    results = [
+        (
+            detection_key(d),
+            ValidationSummary(
+                ValidationResult(
+                    firms_id=d.firms_id,
+                    acq_date=d.acq_date,
+                    before_date=datetime.date(2025, 4, 28),
+                    after_date=datetime.date(2025, 5, 3),
+                    burnt_pixel_count=burnt_pixel_count(d),
+                )
+            ),
+        )
+        for d in detections
+    ]
+    return ChunkResult(results, pd.DataFrame(), Counter(success=len(detections)))
+
+
+class FakeShardedValidator(ShardedValidator):
+    initialize_worker = staticmethod(fake_initialize_worker)
+    validate_chunk = staticmethod(fake_validate_chunk)
+
+
+def test_plan_chunks_keeps_overlapping_detections_together():
+    # two clusters of overlapping detections, far apart
+    detections = [make_detection(i, 30.0 + i * 0.001) for i in range(3)] + [
+        make_detection(i, 30.5 + i * 0.001) for i in range(3, 6)
+    ]
+
+    chunks = plan_chunks(detections, chunk_size=4)
+    assert [[d.firms_id for d in chunk] for chunk in chunks] == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_sharded_validator(tmp_path):
+    store = ResultStore(tmp_path / "store.duckdb")
+    validator = FakeShardedValidator(
+        key_paths=[tmp_path / "a.json", tmp_path / "b.json"],
+        store=store,
+        chunk_size=1,
+    )
+
+    # the same detection in two include areas is validated for both
+    detections = [
+        make_detection(1, 30.0),
+        make_detection(2, 30.5),
+        make_detection(1, 40.0, area="b"),
+    ]
+    results = list(validator.validate_many(detections, {}))
+
+    # merged in FIRMS ID order, whichever chunk finishes first
+    assert [r.firms_id for r in results] == [1, 1, 2]
+    assert [r.burnt_pixel_count for r in results] == [1, 11, 2]
+    assert validator.retry_counts == Counter(success=3)
+    for detection in detections:
+        stored = store.get(detection, PARAMS)
+        assert stored is not None
+        assert stored.burnt_pixel_count == burnt_pixel_count(detection)
+
+    # stored results don't go to the workers, windows are merged in order
+    detections.insert(0, make_detection(3, 30.7))
+    results = list(validator.validate_many(detections, {}, window=2))
+    assert [r.firms_id for r in results] == [1, 3, 1, 2]
+    assert validator.retry_counts == Counter(success=4)
+
+
+def test_sharded_validator_returns_no_data_for_failed_chunks(tmp_path):
+    store = ResultStore(tmp_path / "store.duckdb")
+    validator = FakeShardedValidator(
+        key_paths=[tmp_path / "a.json", tmp_path / "b.json"],
+        store=store,
+        chunk_size=1,
+    )
+
+    detections = [make_detection(FAILING_FIRMS_ID, 30.0), make_detection(2, 30.5)]
+    results = list(validator.validate_many(detections, {}))
+    validated, failed_over = results
+
+    assert validated.firms_id == 2
+    assert not validated.no_data
+    assert store.get(detections[1], PARAMS) is not None
+
+    # like the other backends, without failing the run
+    assert failed_over.firms_id == FAILING_FIRMS_ID
+    assert failed_over.no_data
+    assert store.get(detections[0], PARAMS) is None
@@ -0,0 +1,58 @@
+import datetime
+
+from shapely import Point, box
+
+from burnscar.models import FireDetection
+from burnscar.validators.gee import ValidationResult
+from burnscar.validators.store import ResultStore
+
+PARAMS = {"buffer_distance": 1000, "days_around": 30}
+
+detection = FireDetection(
+    firms_id=1,
+    acq_date=datetime.date(2025, 5, 1),
+    geom=Point(30.0, 15.0).wkb,
+    area_include_geom=box(29, 14, 31, 16).wkb,
+)
+
+
+def test_store_roundtrip(tmp_path):
+    store = ResultStore(tmp_path / "store.duckdb")
+    result = ValidationResult(
+        firms_id=1,
+        acq_date=detection.acq_date,
+        before_date=datetime.date(2025, 4, 28),
+        after_date=datetime.date(2025, 5, 3),
+        burn_scar_detected=True,
+        burnt_pixel_count=42,
+        burnt_building_count=3,
+        burnt_area="POLYGON ((30 15, 30.01 15, 30.01 15.01, 30 15))",
+    )
+    store.put(detection, PARAMS, result)
+
+    renumbered = detection.model_copy(update={"firms_id": 7})
+    assert store.get(renumbered, PARAMS) == result.model_copy(update={"firms_id": 7})
+    assert store.get(detection, {**PARAMS, "days_around": 20}) is None
+
+
+def test_store_skips_results_without_imagery(tmp_path):
+    store = ResultStore(tmp_path / "store.duckdb")
+    result = ValidationResult(firms_id=1, acq_date=detection.acq_date, too_cloudy=True)
+    store.put(detection, PARAMS, result)
+
+    assert store.get(detection, PARAMS) is None
+
+
+def test_store_prune(tmp_path):
+    store = ResultStore(tmp_path / "store.duckdb")
+    result = ValidationResult(
+        firms_id=1,
+        acq_date=detection.acq_date,
+        before_date=datetime.date(2025, 4, 28),
+        after_date=datetime.date(2025, 5, 3),
+    )
+    store.put(detection, PARAMS, result)
+
+    assert store.prune(PARAMS) == 0
+    assert store.prune({**PARAMS, "days_around": 20}) == 1
+    assert store.get(detection, PARAMS) is None